@@ -0,0 +1,22 @@
+"""
+FoodRescue Platform - Shared Benchmark Data
+Constants shared by seed.py and load_test.py. No backend imports, so the
+load generator can run from a machine without the server stack installed.
+"""
+
+# (name, address, latitude, longitude) from the init_db.sql sample data
+SEED_LOCATIONS = [
+    ("Saravana Bhavan - T Nagar", "21 Usman Road, T Nagar, Chennai 600017", 13.0418, 80.2341),
+    ("Hotel Sangeetha - Anna Nagar", "2nd Avenue, Anna Nagar, Chennai 600040", 13.0850, 80.2101),
+    ("Dindigul Thalappakatti - Velachery", "Velachery Main Road, Chennai 600042", 12.9750, 80.2207),
+    ("Murugan Idli Shop - Besant Nagar", "1st Cross Street, Besant Nagar, Chennai 600090", 13.0010, 80.2669),
+    ("Adyar Ananda Bhavan - Adyar", "Lattice Bridge Road, Adyar, Chennai 600020", 13.0067, 80.2571),
+]
+
+BENCH_USER_PASSWORD = "benchpass123"
+# Reserved (RFC 2606) but accepted by EmailStr, unlike .local
+BENCH_USER_DOMAIN = "bench.foodrescue.example"
+
+
+def bench_user_email(index: int) -> str:
+    return f"bench-user-{index}@{BENCH_USER_DOMAIN}"
@@ -0,0 +1,89 @@
+"""
+FoodRescue Platform - Startup Benchmark
+Measures cold import time of the API in fresh interpreters and checks that
+importing the app neither opens a socket nor creates a database engine.
+
+Usage (from backend/):
+    python benchmarks/bench_startup.py [--runs 10] [--output benchmarks/results/startup.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from datetime import datetime
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Unreachable DSN for the child: libpq connects from C, bypassing the socket
+# patch below, so engine creation is checked through database._engines instead
+UNREACHABLE_DATABASE_URL = "postgresql://x@127.0.0.1:1/x?connect_timeout=1"
+
+# Runs inside the child interpreter: block Python sockets, time `import main`,
+# then check that no engine was created during the import
+IMPORT_PROBE = """
+import socket, time, json
+
+def _blocked(*args, **kwargs):
+    raise RuntimeError("network access during import")
+
+socket.socket.connect = _blocked
+socket.create_connection = _blocked
+
+start = time.perf_counter()
+import main
+elapsed = time.perf_counter() - start
+
+import database
+assert not database._engines, f"engines created during import: {sorted(database._engines)}"
+print(json.dumps({"import_seconds": elapsed}))
+"""
+
+
+def run_once() -> float:
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_PROBE],
+        cwd=BACKEND_DIR,
+        env={**os.environ, "DATABASE_URL": UNREACHABLE_DATABASE_URL, "REPLICA_URLS": ""},
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"Import failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])["import_seconds"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--output", default=os.path.join(BACKEND_DIR, "benchmarks", "results", "startup.json"))
+    args = parser.parse_args()
+
+    timings = [run_once() for _ in range(args.runs)]
+    record = {
+        "timestamp": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "runs": args.runs,
+        "min_ms": round(min(timings) * 1000, 2),
+        "median_ms": round(statistics.median(timings) * 1000, 2),
+        "max_ms": round(max(timings) * 1000, 2),
+    }
+
+    # Append to the history so runs can be compared over time
+    history = []
+    if os.path.exists(args.output):
+        with open(args.output) as f:
+            history = json.load(f)
+    history.append(record)
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(history, f, indent=2)
+
+    print(json.dumps(record, indent=2))
+
+
+if __name__ == "__main__":
+    main()
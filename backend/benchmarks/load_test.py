@@ -0,0 +1,329 @@
+"""
+FoodRescue Platform - Load Test Harness
+Runs scripted workloads against a running API (seed it first with seed.py)
+and writes machine-readable results.
+
+Workloads:
+    markers        GET /api/map/markers polling
+    available      GET /api/donations/available polling
+    create         POST /api/donations bursts
+    status         PATCH /api/donations/{id}/status updates
+    login          POST /api/auth/login storms (bench users from seed.py)
+    ws             N /ws clients (idle or pinging) measuring broadcast lag
+
+Usage (from backend/):
+    python benchmarks/load_test.py --base-url http://localhost:8000 \\
+        --workloads markers,create,ws --duration 30 --concurrency 20 --ws-clients 200 \\
+        --output benchmarks/results/run.json [--baseline benchmarks/results/previous.json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import uuid
+from contextlib import suppress
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+import httpx
+import websockets
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_data import SEED_LOCATIONS, BENCH_USER_PASSWORD, bench_user_email  # noqa: E402
+
+ALL_WORKLOADS = ["markers", "available", "create", "status", "login", "ws"]
+STATUS_CYCLE = ["AVAILABLE", "ASSIGNED", "IN_TRANSIT", "AVAILABLE"]
+
+
+# ============================================================================
+# RESULT COLLECTION
+# ============================================================================
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Latency summary in milliseconds"""
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+    if len(ordered) > 1:
+        cuts = statistics.quantiles(ordered, n=100, method="inclusive")
+        p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+    else:
+        p50 = p95 = p99 = ordered[0]
+    return {
+        "count": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+        "p50_ms": round(p50 * 1000, 3),
+        "p95_ms": round(p95 * 1000, 3),
+        "p99_ms": round(p99 * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+
+class WorkloadStats:
+    def __init__(self, name: str):
+        self.name = name
+        self.latencies: List[float] = []
+        self.errors = 0
+        self.started = 0.0
+        self.finished = 0.0
+
+    def record(self, seconds: float, ok: bool):
+        if ok:
+            self.latencies.append(seconds)
+        else:
+            self.errors += 1
+
+    def to_dict(self) -> dict:
+        elapsed = max(self.finished - self.started, 1e-9)
+        return {
+            "requests": len(self.latencies) + self.errors,
+            "errors": self.errors,
+            "throughput_rps": round(len(self.latencies) / elapsed, 2),
+            "latency": summarize(self.latencies),
+        }
+
+
+# ============================================================================
+# HTTP WORKLOADS
+# ============================================================================
+
+async def timed_request(client: httpx.AsyncClient, stats: WorkloadStats, method: str, url: str, **kwargs):
+    start = time.perf_counter()
+    try:
+        response = await client.request(method, url, **kwargs)
+        stats.record(time.perf_counter() - start, response.status_code < 400)
+        return response
+    except httpx.HTTPError:
+        stats.record(time.perf_counter() - start, False)
+        return None
+
+
+def donation_payload(rng: random.Random, donor_name: str) -> dict:
+    name, address, lat, lng = rng.choice(SEED_LOCATIONS)
+    return {
+        "donor_name": donor_name,
+        "donor_phone": "+919876543210",
+        "food_type": rng.choice(["VEG", "NON_VEG", "VEGAN", "MIXED"]),
+        "quantity_kg": round(rng.uniform(1, 60), 1),
+        "description": f"Benchmark surplus from {name}",
+        "latitude": lat + rng.gauss(0, 0.02),
+        "longitude": lng + rng.gauss(0, 0.02),
+        "address": address,
+        "expires_at": (datetime.utcnow() + timedelta(hours=4)).isoformat(),
+    }
+
+
+async def run_http_workload(name: str, client: httpx.AsyncClient, args, ctx: dict) -> WorkloadStats:
+    stats = WorkloadStats(name)
+    rng = random.Random(args.seed)
+    deadline = time.perf_counter() + args.duration
+
+    async def worker(worker_id: int):
+        i = 0
+        while time.perf_counter() < deadline:
+            i += 1
+            if name == "markers":
+                await timed_request(client, stats, "GET", "/api/map/markers")
+            elif name == "available":
+                await timed_request(client, stats, "GET", "/api/donations/available")
+            elif name == "create":
+                # Unique donor name lets ws listeners correlate the broadcast
+                donor_name = f"bench-{uuid.uuid4().hex[:12]}"
+                ctx["sent_at"][donor_name] = time.perf_counter()
+                await timed_request(client, stats, "POST", "/api/donations",
+                                    json=donation_payload(rng, donor_name))
+                if args.burst_pause:
+                    await asyncio.sleep(args.burst_pause)
+            elif name == "status":
+                donation_id = rng.choice(ctx["donation_ids"])
+                new_status = STATUS_CYCLE[(worker_id + i) % len(STATUS_CYCLE)]
+                await timed_request(client, stats, "PATCH", f"/api/donations/{donation_id}/status",
+                                    params={"new_status": new_status})
+            elif name == "login":
+                email = bench_user_email(rng.randrange(args.users))
+                await timed_request(client, stats, "POST", "/api/auth/login",
+                                    json={"email": email, "password": BENCH_USER_PASSWORD})
+
+    stats.started = time.perf_counter()
+    await asyncio.gather(*(worker(w) for w in range(args.concurrency)))
+    stats.finished = time.perf_counter()
+    return stats
+
+
+# ============================================================================
+# WEBSOCKET WORKLOAD
+# ============================================================================
+
+async def ws_client(url: str, active: bool, ping_interval: float, stop: asyncio.Event,
+                    ctx: dict, ping_stats: WorkloadStats, counters: dict):
+    try:
+        async with websockets.connect(url, max_queue=None) as ws:
+            counters["connected"] += 1
+            last_ping = None
+
+            async def pinger():
+                nonlocal last_ping
+                while not stop.is_set():
+                    last_ping = time.perf_counter()
+                    await ws.send("ping")
+                    await asyncio.sleep(ping_interval)
+
+            ping_task = asyncio.create_task(pinger()) if active else None
+            try:
+                while not stop.is_set():
+                    try:
+                        raw = await asyncio.wait_for(ws.recv(), timeout=0.5)
+                    except asyncio.TimeoutError:
+                        continue
+                    received = time.perf_counter()
+                    message = json.loads(raw)
+                    event = message.get("event")
+                    if event == "PONG" and last_ping is not None:
+                        ping_stats.record(received - last_ping, True)
+                    elif event == "NEW_DONATION":
+                        sent = ctx["sent_at"].get(message["data"].get("donor_name"))
+                        if sent is not None:
+                            ctx["broadcast_lag"].append(received - sent)
+                    counters["messages"] += 1
+            finally:
+                if ping_task:
+                    ping_task.cancel()
+                    # Collect the pinger's own exception (e.g. ConnectionClosed) so it is
+                    # not reported as never retrieved; recv() above records the failure
+                    with suppress(asyncio.CancelledError, OSError, websockets.WebSocketException):
+                        await ping_task
+    except (OSError, websockets.WebSocketException):
+        counters["failed"] += 1
+
+
+# ============================================================================
+# RUNNER
+# ============================================================================
+
+async def run(args) -> dict:
+    workloads = [w.strip() for w in args.workloads.split(",") if w.strip()]
+    unknown = set(workloads) - set(ALL_WORKLOADS)
+    if unknown:
+        raise SystemExit(f"Unknown workloads: {', '.join(sorted(unknown))}")
+
+    ctx = {"sent_at": {}, "broadcast_lag": [], "donation_ids": []}
+    limits = httpx.Limits(max_connections=args.concurrency * len(workloads) + 10)
+    results = {}
+
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        if "status" in workloads:
+            response = await client.get("/api/donations", params={"limit": 1000})
+            ctx["donation_ids"] = [d["id"] for d in response.json()]
+            if not ctx["donation_ids"]:
+                raise SystemExit("No donations found; run seed.py first")
+
+        stop = asyncio.Event()
+        ws_tasks = []
+        ws_ping_stats = WorkloadStats("ws_ping")
+        ws_counters = {"connected": 0, "failed": 0, "messages": 0}
+        if "ws" in workloads:
+            ws_url = args.base_url.replace("http", "ws", 1).rstrip("/") + "/ws"
+            active_count = int(args.ws_clients * args.ws_active_ratio)
+            for i in range(args.ws_clients):
+                ws_tasks.append(asyncio.create_task(ws_client(
+                    ws_url, i < active_count, args.ws_ping_interval, stop, ctx, ws_ping_stats, ws_counters
+                )))
+            # Give the fan-out set a moment to fill before load starts
+            await asyncio.sleep(min(2.0, 0.01 * args.ws_clients + 0.5))
+
+        http_workloads = [w for w in workloads if w != "ws"]
+        ws_ping_stats.started = time.perf_counter()
+        if http_workloads:
+            finished = await asyncio.gather(*(run_http_workload(w, client, args, ctx) for w in http_workloads))
+            results.update({stats.name: stats.to_dict() for stats in finished})
+        else:
+            await asyncio.sleep(args.duration)
+
+        if ws_tasks:
+            # Let in-flight broadcasts land before closing
+            await asyncio.sleep(1.0)
+            stop.set()
+            await asyncio.gather(*ws_tasks)
+            ws_ping_stats.finished = time.perf_counter()
+            results["ws"] = {
+                "clients": args.ws_clients,
+                "connected": ws_counters["connected"],
+                "failed": ws_counters["failed"],
+                "messages_received": ws_counters["messages"],
+                "ping_rtt": summarize(ws_ping_stats.latencies),
+                "broadcast_lag": summarize(ctx["broadcast_lag"]),
+            }
+
+    return {
+        "meta": {
+            "timestamp": datetime.utcnow().isoformat(),
+            "base_url": args.base_url,
+            "python": platform.python_version(),
+            "workloads": workloads,
+            "duration_s": args.duration,
+            "concurrency": args.concurrency,
+            "ws_clients": args.ws_clients if "ws" in workloads else 0,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict):
+    """Print p95/throughput deltas against a previous run"""
+    print("\nComparison with baseline:")
+    for name, result in current["results"].items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous:
+            continue
+        for key in ("p95_ms", "p99_ms"):
+            for section in ("latency", "broadcast_lag"):
+                now_value = result.get(section, {}).get(key)
+                old_value = previous.get(section, {}).get(key)
+                if now_value is not None and old_value:
+                    change = (now_value - old_value) / old_value * 100
+                    print(f"  {name:10s} {section}.{key}: {old_value} -> {now_value} ({change:+.1f}%)")
+        if "throughput_rps" in result and previous.get("throughput_rps"):
+            change = (result["throughput_rps"] - previous["throughput_rps"]) / previous["throughput_rps"] * 100
+            print(f"  {name:10s} throughput_rps: {previous['throughput_rps']} -> {result['throughput_rps']} ({change:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--workloads", default="markers,available,create,status,ws")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds per run")
+    parser.add_argument("--concurrency", type=int, default=10, help="Workers per HTTP workload")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--burst-pause", type=float, default=0.0, help="Sleep between creates per worker")
+    parser.add_argument("--users", type=int, default=100, help="Bench users seeded by seed.py")
+    parser.add_argument("--ws-clients", type=int, default=100)
+    parser.add_argument("--ws-active-ratio", type=float, default=0.1, help="Share of ws clients that ping")
+    parser.add_argument("--ws-ping-interval", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="Write results JSON here")
+    parser.add_argument("--baseline", default=None, help="Previous results JSON to compare against")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    print(json.dumps(report, indent=2))
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+FoodRescue Platform - Benchmark Data Seeder
+Fills a throwaway PostGIS database with synthetic donations (scattered around the
+Chennai sample locations from init_db.sql) and verified benchmark users.
+
+Usage (from backend/):
+    python benchmarks/seed.py --database-url postgresql://... --donations 50000 --users 200
+"""
+
+import argparse
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine, delete  # noqa: E402
+
+import main  # noqa: E402,F401  (registers all models on Base)
+from main import Donation, DonationStatus, FoodType  # noqa: E402
+from auth import User, UserRole, get_password_hash  # noqa: E402
+from rollups import assignment_latency, daily_food, status_counts  # noqa: E402
+from heatmap import heatmap_cells  # noqa: E402
+from database import init_schema  # noqa: E402
+from bench_data import (  # noqa: E402
+    BENCH_USER_DOMAIN, BENCH_USER_PASSWORD, SEED_LOCATIONS, bench_user_email
+)
+
+SAMPLE_DESCRIPTIONS = [
+    "Idli, dosa batter and sambar - prepared this morning",
+    "Rice, dal and vegetables from lunch service",
+    "Biryani and chicken curry - prepared 1 hour ago",
+    "Coconut chutney and tomato chutney - fresh batch",
+    "Mixed sweets and savories - closing inventory",
+    "Curd rice and lemon rice packets",
+    "Chapati with paneer butter masala",
+    "Vegetable pulao and raita",
+    "Parotta and salna from dinner service",
+    "Pongal and vada - breakfast leftovers",
+    "Fried rice and gobi manchurian",
+    "Bread, buns and puffs from the bakery",
+    "Fish curry and steamed rice",
+    "Fruit platters - cut this afternoon",
+    "Meals packets - sambar, rasam, poriyal",
+]
+
+# Address variety keeps search selectivity realistic
+SAMPLE_STREETS = [
+    "Usman Road", "2nd Avenue", "Velachery Main Road", "1st Cross Street", "Lattice Bridge Road",
+    "Anna Salai", "Poonamallee High Road", "Arcot Road", "LB Road", "Kamarajar Salai",
+]
+SAMPLE_LOCALITIES = [
+    "T Nagar", "Anna Nagar", "Velachery", "Besant Nagar", "Adyar", "Mylapore", "Nungambakkam",
+    "Egmore", "Kodambakkam", "Vadapalani", "Guindy", "Saidapet", "Tambaram", "Porur", "Perambur",
+    "Royapettah", "Thiruvanmiyur", "Chromepet", "Ashok Nagar", "KK Nagar", "Ambattur", "Kilpauk",
+    "Alwarpet", "Sholinganallur", "Triplicane",
+]
+
+# Weighted so most of the table is history, like production (expired
+# AVAILABLE rows are removed by the cleanup endpoint)
+STATUS_WEIGHTS = {
+    DonationStatus.AVAILABLE: 0.03,
+    DonationStatus.ASSIGNED: 0.02,
+    DonationStatus.IN_TRANSIT: 0.01,
+    DonationStatus.DELIVERED: 0.8,
+    DonationStatus.CANCELLED: 0.14,
+}
+
+
+def make_donation_row(rng: random.Random, now: datetime, spread_km: float, history_days: int) -> dict:
+    name, _, lat, lng = rng.choice(SEED_LOCATIONS)
+    address = (f"{rng.randint(1, 250)} {rng.choice(SAMPLE_STREETS)}, "
+               f"{rng.choice(SAMPLE_LOCALITIES)}, Chennai 600{rng.randint(1, 120):03d}")
+    # ~111 km per degree; good enough for a synthetic scatter
+    latitude = lat + rng.gauss(0, spread_km / 111.0)
+    longitude = lng + rng.gauss(0, spread_km / 111.0)
+    status = rng.choices(list(STATUS_WEIGHTS), weights=list(STATUS_WEIGHTS.values()))[0]
+    created_at = now - timedelta(minutes=rng.randint(0, history_days * 24 * 60))
+    if status == DonationStatus.AVAILABLE:
+        created_at = now - timedelta(minutes=rng.randint(0, 6 * 60))
+    expires_at = created_at + timedelta(hours=rng.uniform(1, 8))
+    assigned = status in (DonationStatus.ASSIGNED, DonationStatus.IN_TRANSIT, DonationStatus.DELIVERED)
+
+    return {
+        "donor_name": name,
+        "donor_phone": f"+9198765{rng.randint(10000, 99999)}",
+        "food_type": rng.choice(list(FoodType)),
+        "quantity_kg": round(rng.uniform(1, 60), 1),
+        "description": rng.choice(SAMPLE_DESCRIPTIONS),
+        "latitude": latitude,
+        "longitude": longitude,
+        "location": f"SRID=4326;POINT({longitude} {latitude})",
+        "address": address,
+        "status": status,
+        "created_at": created_at,
+        "expires_at": expires_at,
+        "assigned_volunteer_id": rng.randint(1, 500) if assigned else None,
+        "assigned_at": created_at + timedelta(minutes=rng.randint(1, 90)) if assigned else None,
+    }
+
+
+def seed(database_url: str, donations: int, users: int, batch_size: int,
+         spread_km: float, history_days: int, reset: bool, seed_value: int):
+    engine = create_engine(database_url)
+    init_schema(engine)
+    rng = random.Random(seed_value)
+    now = datetime.utcnow()
+
+    with engine.begin() as conn:
+        if reset:
+            conn.execute(delete(Donation.__table__))
+            # Trigger-maintained summaries keep history across deletes
+            for table in (status_counts, daily_food, assignment_latency, heatmap_cells):
+                conn.execute(delete(table))
+            conn.execute(delete(User.__table__).where(User.email.like(f"%@{BENCH_USER_DOMAIN}")))
+
+        for start in range(0, donations, batch_size):
+            count = min(batch_size, donations - start)
+            rows = [make_donation_row(rng, now, spread_km, history_days) for _ in range(count)]
+            conn.execute(Donation.__table__.insert(), rows)
+            print(f"  donations: {start + count}/{donations}", end="\r")
+        print()
+
+        # One hash for all users; bcrypt is deliberately slow
+        password_hash = get_password_hash(BENCH_USER_PASSWORD)
+        existing = {
+            row[0] for row in conn.execute(
+                User.__table__.select().with_only_columns(User.email)
+                .where(User.email.like(f"%@{BENCH_USER_DOMAIN}"))
+            )
+        }
+        user_rows = [
+            {
+                "name": f"Bench User {i}",
+                "email": bench_user_email(i),
+                "phone": "+919876543210",
+                "password_hash": password_hash,
+                "role": UserRole.VOLUNTEER,
+                "is_verified": 1,
+                "created_at": now,
+            }
+            for i in range(users) if bench_user_email(i) not in existing
+        ]
+        if user_rows:
+            conn.execute(User.__table__.insert(), user_rows)
+
+        conn.exec_driver_sql("ANALYZE")
+
+    engine.dispose()
+    print(f"✅ Seeded {donations} donations and {len(user_rows)} users")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    # Required (no default from DATABASE_URL): --reset deletes every donation
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--donations", type=int, default=10000)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--spread-km", type=float, default=3.0, help="Std-dev of the scatter around each seed")
+    parser.add_argument("--history-days", type=int, default=180)
+    parser.add_argument("--reset", action="store_true", help="Delete existing donations and bench users first")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for reproducible data")
+    args = parser.parse_args()
+
+    seed(args.database_url, args.donations, args.users, args.batch_size,
+         args.spread_km, args.history_days, args.reset, args.seed)
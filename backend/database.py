@@ -0,0 +1,166 @@
+"""
+FoodRescue Platform - Database Setup
+Shared declarative base, lazily created engine and session dependency.
+Importing this module never opens a connection.
+"""
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import sessionmaker
+from typing import Dict, Optional
+
+from config import settings
+
+Base = declarative_base()
+
+# Bound to the engine on first use (see get_engine)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False)
+
+# Engines created so far, by name ("primary", "replica-0", ...)
+_engines: Dict[str, Engine] = {}
+
+
+def get_named_engine(name: str, url: str, **engine_kwargs) -> Engine:
+    """Create (once) and return the engine registered under `name`"""
+    engine = _engines.get(name)
+    if engine is None:
+        engine = create_engine(url, pool_pre_ping=True, **engine_kwargs)
+        _engines[name] = engine
+    return engine
+
+
+def get_engine() -> Engine:
+    """Create the primary engine on first use instead of at import time"""
+    if "primary" not in _engines:
+        SessionLocal.configure(bind=get_named_engine("primary", settings.database_url))
+    return _engines["primary"]
+
+
+def active_engines() -> Dict[str, Engine]:
+    """Engines created so far, by name (for pool metrics)"""
+    return dict(_engines)
+
+
+def dispose_engine():
+    for engine in _engines.values():
+        engine.dispose()
+    _engines.clear()
+
+
+# ============================================================================
+# SCHEMA SETUP
+# ============================================================================
+
+# Idempotent DDL run before create_all
+PRE_CREATE_STATEMENTS = [
+    "CREATE EXTENSION IF NOT EXISTS postgis",
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+]
+
+# Full-text document for donation search. Queries must use this exact
+# expression for the planner to match the GIN index below.
+DONATION_SEARCH_DOCUMENT = "to_tsvector('simple', coalesce(description, '') || ' ' || address)"
+
+# Idempotent DDL run after create_all (triggers, backfills, ...)
+POST_CREATE_STATEMENTS = []
+
+
+def create_trigger_if_missing(name: str, table: str, definition: str) -> str:
+    """
+    DDL creating trigger `name` on `table` only if absent. Dropping and
+    recreating it would take an ACCESS EXCLUSIVE lock on every startup.
+    `definition` is everything after CREATE TRIGGER <name>; changing it
+    needs a manual DROP TRIGGER first.
+    """
+    return f"""
+    DO $$
+    BEGIN
+        IF NOT EXISTS (
+            SELECT 1 FROM pg_trigger WHERE tgname = '{name}' AND tgrelid = '{table}'::regclass
+        ) THEN
+            CREATE TRIGGER {name} {definition};
+        END IF;
+    END
+    $$
+    """
+
+# Indexes on donations (name -> definition), built CONCURRENTLY (outside a
+# transaction) so migrating a live database does not block writes. Hot-path
+# queries are checked against these by tests/test_query_plans.py.
+INDEXES = {
+    # Map markers / available list: status = 'AVAILABLE' ORDER BY expires_at
+    "idx_donations_available_expires": "ON donations (status, expires_at) WHERE status = 'AVAILABLE'",
+    # Expiry cleanup
+    "idx_donations_expires_at": "ON donations (expires_at)",
+    # Radius filters (same name geoalchemy2 uses, so this is a no-op on tables it created)
+    "idx_donations_location": "ON donations USING GIST (location)",
+    # Search
+    "idx_donations_search": f"ON donations USING GIN ({DONATION_SEARCH_DOCUMENT})",
+    "idx_donations_address_trgm": "ON donations USING GIN (address gin_trgm_ops)",
+}
+
+# Indexes left INVALID by an interrupted concurrent build. IF NOT EXISTS would
+# skip them forever, so they are dropped and rebuilt. Builds still running
+# (e.g. another worker starting up) show up in pg_stat_progress_create_index
+# and are left alone.
+INVALID_INDEXES_QUERY = """
+    SELECT c.relname
+    FROM pg_index i
+    JOIN pg_class c ON c.oid = i.indexrelid
+    WHERE NOT i.indisvalid
+      AND c.relname = ANY(:names)
+      AND pg_table_is_visible(c.oid)
+      AND i.indexrelid NOT IN (SELECT index_relid FROM pg_stat_progress_create_index)
+"""
+
+
+# pg_advisory_lock key serializing schema setup across processes
+SCHEMA_LOCK_KEY = 727361
+
+
+def init_schema(engine: Optional[Engine] = None):
+    """
+    Create extensions, tables and indexes.
+    Models must be imported (registered on Base) before calling this.
+    Holds an advisory lock so workers booting together (AUTO_MIGRATE) run it
+    one at a time instead of racing on CREATE EXTENSION / create_all.
+    """
+    engine = engine or get_engine()
+    # Session-level lock on an autocommit connection: no open transaction for
+    # CREATE INDEX CONCURRENTLY to wait on
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as lock_conn:
+        lock_conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": SCHEMA_LOCK_KEY})
+        try:
+            _apply_schema(engine)
+        finally:
+            lock_conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": SCHEMA_LOCK_KEY})
+
+
+def _apply_schema(engine: Engine):
+    with engine.begin() as conn:
+        for statement in PRE_CREATE_STATEMENTS:
+            conn.execute(text(statement))
+    Base.metadata.create_all(bind=engine)
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        invalid = conn.execute(text(INVALID_INDEXES_QUERY), {"names": list(INDEXES)}).scalars().all()
+        for name in invalid:
+            conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+        for name, definition in INDEXES.items():
+            conn.execute(text(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} {definition}"))
+    with engine.begin() as conn:
+        for statement in POST_CREATE_STATEMENTS:
+            conn.execute(text(statement))
+
+
+# ============================================================================
+# DEPENDENCY
+# ============================================================================
+
+def get_db():
+    get_engine()
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
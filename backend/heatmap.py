@@ -0,0 +1,183 @@
+"""
+FoodRescue Platform - Supply Density Heatmap
+Donations aggregated into geohash cells per day at several resolutions,
+maintained by a trigger so /api/map/heatmap never touches the donations table.
+"""
+
+from datetime import date, datetime, timedelta
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel
+from sqlalchemy import Column, Date, Float, Integer, String, Table, func, select, text
+from sqlalchemy.orm import Session
+
+from database import Base, POST_CREATE_STATEMENTS, create_trigger_if_missing
+from routing import get_read_db
+
+# Geohash precisions kept: ~39 km, ~4.9 km, ~1.2 km and ~150 m cells
+PRECISIONS = (4, 5, 6, 7)
+DEFAULT_PRECISION = 6
+MAX_RANGE_DAYS = 366
+
+# ============================================================================
+# CELL TABLE
+# ============================================================================
+
+# One row per (geohash precision, creation day, geohash).
+# expired_* counts donations removed while still AVAILABLE after expiry.
+heatmap_cells = Table(
+    "heatmap_cells", Base.metadata,
+    Column("geohash_precision", Integer, primary_key=True),
+    Column("day", Date, primary_key=True),
+    Column("geohash", String(12), primary_key=True),
+    Column("donation_count", Integer, nullable=False, default=0),
+    Column("total_kg", Float, nullable=False, default=0),
+    Column("expired_count", Integer, nullable=False, default=0),
+    Column("expired_kg", Float, nullable=False, default=0),
+)
+
+# ============================================================================
+# TRIGGER + BACKFILL (run by init_schema after create_all)
+# ============================================================================
+
+_PRECISIONS_SQL = "ARRAY[" + ", ".join(str(p) for p in PRECISIONS) + "]"
+_GEOHASH_SQL = "ST_GeoHash(ST_SetSRID(ST_MakePoint({lng}, {lat}), 4326), " + str(max(PRECISIONS)) + ")"
+
+TRIGGER_STATEMENTS = [
+    f"""
+    CREATE OR REPLACE FUNCTION heatmap_donation_change() RETURNS trigger AS $$
+    DECLARE
+        cell text;
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            cell := {_GEOHASH_SQL.format(lng="NEW.longitude", lat="NEW.latitude")};
+            INSERT INTO heatmap_cells (geohash_precision, day, geohash, donation_count, total_kg, expired_count, expired_kg)
+            SELECT p, NEW.created_at::date, left(cell, p), 1, NEW.quantity_kg, 0, 0
+            FROM unnest({_PRECISIONS_SQL}) AS p
+            ON CONFLICT (geohash_precision, day, geohash) DO UPDATE SET
+                donation_count = heatmap_cells.donation_count + 1,
+                total_kg = heatmap_cells.total_kg + EXCLUDED.total_kg;
+            RETURN NEW;
+        END IF;
+
+        -- DELETE: rows cleaned up while still unclaimed after expiry
+        IF OLD.status::text = 'AVAILABLE' AND OLD.expires_at < now() AT TIME ZONE 'UTC' THEN
+            cell := {_GEOHASH_SQL.format(lng="OLD.longitude", lat="OLD.latitude")};
+            UPDATE heatmap_cells SET
+                expired_count = expired_count + 1,
+                expired_kg = expired_kg + OLD.quantity_kg
+            WHERE day = OLD.created_at::date
+              AND geohash_precision = ANY({_PRECISIONS_SQL})
+              AND geohash = left(cell, geohash_precision);
+        END IF;
+        RETURN OLD;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    create_trigger_if_missing(
+        "donations_heatmap", "donations",
+        "AFTER INSERT OR DELETE ON donations FOR EACH ROW EXECUTE FUNCTION heatmap_donation_change()",
+    ),
+]
+
+# Backfill from existing rows; skipped (no scan) once cells exist
+BACKFILL_STATEMENTS = [
+    f"""
+    INSERT INTO heatmap_cells (geohash_precision, day, geohash, donation_count, total_kg, expired_count, expired_kg)
+    SELECT p, d.created_at::date, left(d.cell, p), count(*), sum(d.quantity_kg), 0, 0
+    FROM (
+        SELECT created_at, quantity_kg, {_GEOHASH_SQL.format(lng="longitude", lat="latitude")} AS cell
+        FROM donations
+        WHERE NOT EXISTS (SELECT 1 FROM heatmap_cells)
+    ) AS d
+    CROSS JOIN unnest({_PRECISIONS_SQL}) AS p
+    GROUP BY 1, 2, 3
+    ON CONFLICT (geohash_precision, day, geohash) DO NOTHING
+    """,
+]
+
+# Registered on import, like the models on Base
+POST_CREATE_STATEMENTS.extend(TRIGGER_STATEMENTS + BACKFILL_STATEMENTS)
+
+
+def rebuild_heatmap(db: Session):
+    """Recompute donation totals from the donations table (expiry history is lost)"""
+    db.execute(text("LOCK TABLE donations IN SHARE MODE"))
+    db.execute(heatmap_cells.delete())
+    for statement in BACKFILL_STATEMENTS:
+        db.execute(text(statement))
+    db.commit()
+
+
+# ============================================================================
+# PYDANTIC SCHEMAS
+# ============================================================================
+
+class HeatmapCell(BaseModel):
+    geohash: str
+    latitude: float
+    longitude: float
+    donation_count: int
+    total_kg: float
+    expired_count: int
+    expired_ratio: float
+
+
+# ============================================================================
+# API ROUTER
+# ============================================================================
+
+router = APIRouter(prefix="/api/map", tags=["Map"])
+
+
+@router.get("/heatmap", response_model=List[HeatmapCell])
+def get_heatmap(
+    precision: int = DEFAULT_PRECISION,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    db: Session = Depends(get_read_db)
+):
+    """
+    Supply density per geohash cell over [start, end] (creation day, default
+    last 30 days): donation count, kg and share expired unclaimed.
+    """
+    if precision not in PRECISIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"precision must be one of {', '.join(str(p) for p in PRECISIONS)}"
+        )
+
+    end = end or datetime.utcnow().date()
+    start = start or end - timedelta(days=30)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+    if (end - start).days > MAX_RANGE_DAYS:
+        raise HTTPException(status_code=400, detail=f"Range is limited to {MAX_RANGE_DAYS} days")
+
+    donation_count = func.sum(heatmap_cells.c.donation_count)
+    expired_count = func.sum(heatmap_cells.c.expired_count)
+    center = func.ST_PointFromGeoHash(heatmap_cells.c.geohash)
+    rows = db.execute(
+        select(
+            heatmap_cells.c.geohash,
+            func.ST_Y(center).label("latitude"),
+            func.ST_X(center).label("longitude"),
+            donation_count.label("donation_count"),
+            func.sum(heatmap_cells.c.total_kg).label("total_kg"),
+            expired_count.label("expired_count"),
+        )
+        .where(
+            heatmap_cells.c.geohash_precision == precision,
+            heatmap_cells.c.day.between(start, end),
+        )
+        .group_by(heatmap_cells.c.geohash)
+    ).mappings().all()
+
+    return [
+        HeatmapCell(
+            **row,
+            expired_ratio=round(row["expired_count"] / row["donation_count"], 3) if row["donation_count"] else 0.0,
+        )
+        for row in rows
+    ]
@@ -76,6 +76,12 @@ CREATE INDEX IF NOT EXISTS idx_donations_expires_at ON donations(expires_at);
 -- Spatial index for geospatial queries (automatically created by PostGIS)
 CREATE INDEX IF NOT EXISTS idx_donations_location ON donations USING GIST(location);
 
+-- Map markers / available list: only AVAILABLE rows, in expiry order
+CREATE INDEX IF NOT EXISTS idx_donations_available_expires ON donations(status, expires_at)
+    WHERE status = 'AVAILABLE';
+
+-- Further indexes (search, trigram) and rollup triggers: run `python migrate.py`
+
 -- ============================================================================
 -- SAMPLE DATA for Testing
 -- ============================================================================
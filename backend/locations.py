@@ -0,0 +1,397 @@
+"""
+FoodRescue Platform - Volunteer Live Locations
+Latest GPS fix per volunteer held in an in-memory grid for fast
+nearest-volunteer queries; only downsampled tracks are written to the
+database, in batches.
+"""
+
+import asyncio
+import json
+import logging
+import math
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+from fastapi import APIRouter, HTTPException, Query, WebSocket, WebSocketDisconnect
+from pydantic import BaseModel, Field, ValidationError
+from sqlalchemy import Column, DateTime, Float, Index, Integer, Table
+
+from auth import UserRole, decode_token
+from config import settings
+from database import Base, get_engine
+from metrics import LOCATION_FIXES, LOCATION_TRACK_BUFFER, LOCATION_VOLUNTEERS
+
+EARTH_RADIUS_M = 6371000.0
+METERS_PER_DEGREE_LAT = 111320.0
+BRUTE_FORCE_LIMIT = 64
+# Track points kept while the database is unreachable; oldest are dropped beyond this
+MAX_TRACK_BUFFER = 50000
+
+logger = logging.getLogger("foodrescue.locations")
+
+# Roles allowed to see live volunteer positions
+DISPATCH_ROLES = {UserRole.DISPATCHER.value, UserRole.NGO.value, UserRole.ADMIN.value}
+
+# ============================================================================
+# TRACK TABLE (downsampled history)
+# ============================================================================
+
+volunteer_tracks = Table(
+    "volunteer_tracks", Base.metadata,
+    Column("id", Integer, primary_key=True),
+    Column("volunteer_id", Integer, nullable=False),
+    Column("latitude", Float, nullable=False),
+    Column("longitude", Float, nullable=False),
+    Column("recorded_at", DateTime, nullable=False),
+    Index("idx_volunteer_tracks_volunteer_time", "volunteer_id", "recorded_at"),
+)
+
+
+def haversine_m(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(a))
+
+
+# ============================================================================
+# IN-MEMORY SPATIAL GRID
+# ============================================================================
+
+class Fix:
+    __slots__ = ("volunteer_id", "latitude", "longitude", "available", "timestamp", "cell")
+
+    def __init__(self, volunteer_id: int, latitude: float, longitude: float,
+                 available: bool, timestamp: float, cell: Tuple[int, int]):
+        self.volunteer_id = volunteer_id
+        self.latitude = latitude
+        self.longitude = longitude
+        self.available = available
+        self.timestamp = timestamp
+        self.cell = cell
+
+
+class LocationGrid:
+    """
+    Uniform lat/lng grid of the latest fix per volunteer.
+    Not thread-safe: only touch it from the event loop (async handlers).
+    """
+
+    def __init__(self, cell_deg: float):
+        self.cell_deg = cell_deg
+        self.fixes: Dict[int, Fix] = {}
+        self.cells: Dict[Tuple[int, int], Set[int]] = {}
+
+    def _cell(self, latitude: float, longitude: float) -> Tuple[int, int]:
+        return (math.floor(latitude / self.cell_deg), math.floor(longitude / self.cell_deg))
+
+    def update(self, volunteer_id: int, latitude: float, longitude: float,
+               available: bool = True, timestamp: Optional[float] = None) -> Fix:
+        cell = self._cell(latitude, longitude)
+        timestamp = timestamp if timestamp is not None else time.time()
+        fix = self.fixes.get(volunteer_id)
+
+        if fix is None:
+            fix = Fix(volunteer_id, latitude, longitude, available, timestamp, cell)
+            self.fixes[volunteer_id] = fix
+            self.cells.setdefault(cell, set()).add(volunteer_id)
+            return fix
+
+        if fix.cell != cell:
+            self._remove_from_cell(volunteer_id, fix.cell)
+            self.cells.setdefault(cell, set()).add(volunteer_id)
+            fix.cell = cell
+        fix.latitude = latitude
+        fix.longitude = longitude
+        fix.available = available
+        fix.timestamp = timestamp
+        return fix
+
+    def remove(self, volunteer_id: int):
+        fix = self.fixes.pop(volunteer_id, None)
+        if fix is not None:
+            self._remove_from_cell(volunteer_id, fix.cell)
+
+    def _remove_from_cell(self, volunteer_id: int, cell: Tuple[int, int]):
+        members = self.cells.get(cell)
+        if members is not None:
+            members.discard(volunteer_id)
+            if not members:
+                del self.cells[cell]
+
+    def prune(self, max_age_seconds: float) -> int:
+        cutoff = time.time() - max_age_seconds
+        stale = [vid for vid, fix in self.fixes.items() if fix.timestamp < cutoff]
+        for volunteer_id in stale:
+            self.remove(volunteer_id)
+        return len(stale)
+
+    def _ring(self, ci: int, cj: int, ring: int):
+        if ring == 0:
+            yield (ci, cj)
+            return
+        for dj in range(-ring, ring + 1):
+            yield (ci - ring, cj + dj)
+            yield (ci + ring, cj + dj)
+        for di in range(-ring + 1, ring):
+            yield (ci + di, cj - ring)
+            yield (ci + di, cj + ring)
+
+    def nearest(self, latitude: float, longitude: float, k: int,
+                max_age_seconds: float, max_distance_m: float) -> List[Tuple[float, Fix]]:
+        """k closest available, fresh volunteers as (distance_m, fix), closest first"""
+        if not self.fixes:
+            return []
+
+        cutoff = time.time() - max_age_seconds
+        deg = self.cell_deg
+        ci, cj = self._cell(latitude, longitude)
+        # Equirectangular projection around the query point; accurate to well
+        # under 1% at city scale and much cheaper than haversine per candidate
+        m_per_deg_lat = METERS_PER_DEGREE_LAT
+        m_per_deg_lng = METERS_PER_DEGREE_LAT * max(math.cos(math.radians(latitude)), 0.01)
+        max_ring = int(max_distance_m / (deg * m_per_deg_lng)) + 1
+        max_distance_sq = max_distance_m * max_distance_m
+
+        found: List[Tuple[float, Fix]] = []
+        seen = 0
+        # Few volunteers: a flat scan beats walking mostly empty rings
+        rings = [None] if len(self.fixes) <= BRUTE_FORCE_LIMIT else range(max_ring + 1)
+        for ring in rings:
+            if ring and len(found) >= k:
+                # Closest any point of this ring can be: distance to the edge
+                # of the block of cells already scanned
+                edge_m = min(
+                    (latitude - (ci - ring + 1) * deg) * m_per_deg_lat,
+                    ((ci + ring) * deg - latitude) * m_per_deg_lat,
+                    (longitude - (cj - ring + 1) * deg) * m_per_deg_lng,
+                    ((cj + ring) * deg - longitude) * m_per_deg_lng,
+                )
+                if found[k - 1][0] <= edge_m * edge_m:
+                    break
+
+            if ring is None:
+                groups = [self.fixes]
+            else:
+                groups = (self.cells.get(cell) for cell in self._ring(ci, cj, ring))
+            for members in groups:
+                if not members:
+                    continue
+                for volunteer_id in members:
+                    seen += 1
+                    fix = self.fixes[volunteer_id]
+                    if not fix.available or fix.timestamp < cutoff:
+                        continue
+                    dy = (fix.latitude - latitude) * m_per_deg_lat
+                    dx = (fix.longitude - longitude) * m_per_deg_lng
+                    distance_sq = dx * dx + dy * dy
+                    if distance_sq <= max_distance_sq:
+                        found.append((distance_sq, fix))
+
+            if len(found) >= k:
+                found.sort(key=lambda item: item[0])
+                del found[k:]
+            if seen >= len(self.fixes):
+                break
+
+        found.sort(key=lambda item: item[0])
+        return [(math.sqrt(distance_sq), fix) for distance_sq, fix in found[:k]]
+
+
+# ============================================================================
+# DOWNSAMPLED TRACK PERSISTENCE
+# ============================================================================
+
+class TrackRecorder:
+    """Buffers one point per volunteer per interval/distance step and bulk-inserts them"""
+
+    def __init__(self):
+        self.buffer: List[dict] = []
+        self._last_kept: Dict[int, Tuple[float, float, float]] = {}
+
+    def offer(self, fix: Fix):
+        last = self._last_kept.get(fix.volunteer_id)
+        if last is not None:
+            last_time, last_lat, last_lng = last
+            if (fix.timestamp - last_time < settings.track_min_interval_seconds
+                    and haversine_m(last_lat, last_lng, fix.latitude, fix.longitude) < settings.track_min_distance_m):
+                return
+        self._last_kept[fix.volunteer_id] = (fix.timestamp, fix.latitude, fix.longitude)
+        self.buffer.append({
+            "volunteer_id": fix.volunteer_id,
+            "latitude": fix.latitude,
+            "longitude": fix.longitude,
+            "recorded_at": datetime.utcfromtimestamp(fix.timestamp),
+        })
+        LOCATION_TRACK_BUFFER.set(len(self.buffer))
+
+    def forget(self, volunteer_ids: List[int]):
+        for volunteer_id in volunteer_ids:
+            self._last_kept.pop(volunteer_id, None)
+
+    async def flush(self):
+        if not self.buffer:
+            return
+        rows, self.buffer = self.buffer, []
+        LOCATION_TRACK_BUFFER.set(0)
+        try:
+            await asyncio.to_thread(_insert_tracks, rows)
+        except Exception:
+            # Put the batch back ahead of points offered meanwhile and retry next flush
+            self.buffer = rows + self.buffer
+            dropped = len(self.buffer) - MAX_TRACK_BUFFER
+            if dropped > 0:
+                del self.buffer[:dropped]
+                logger.warning("Track buffer full; dropped %d oldest points", dropped)
+            LOCATION_TRACK_BUFFER.set(len(self.buffer))
+            raise
+
+
+def _insert_tracks(rows: List[dict]):
+    with get_engine().begin() as conn:
+        conn.execute(volunteer_tracks.insert(), rows)
+
+
+grid = LocationGrid(settings.location_cell_deg)
+tracks = TrackRecorder()
+
+
+def record_fix(volunteer_id: int, latitude: float, longitude: float, available: bool = True) -> Fix:
+    fix = grid.update(volunteer_id, latitude, longitude, available)
+    tracks.offer(fix)
+    LOCATION_FIXES.inc()
+    LOCATION_VOLUNTEERS.set(len(grid.fixes))
+    return fix
+
+
+def nearest_volunteers(latitude: float, longitude: float, k: int = 5) -> List[dict]:
+    now = time.time()
+    return [
+        {
+            "volunteer_id": fix.volunteer_id,
+            "latitude": fix.latitude,
+            "longitude": fix.longitude,
+            "distance_m": round(distance, 1),
+            "age_seconds": round(now - fix.timestamp, 1),
+        }
+        for distance, fix in grid.nearest(
+            latitude, longitude, k, settings.location_max_age_seconds, settings.location_max_distance_m
+        )
+    ]
+
+
+async def run_track_flusher():
+    """Lifespan task: flush tracks and drop stale volunteers periodically"""
+    try:
+        while True:
+            await asyncio.sleep(settings.track_flush_seconds)
+            stale_before = set(grid.fixes)
+            grid.prune(settings.location_max_age_seconds)
+            tracks.forget(list(stale_before - set(grid.fixes)))
+            LOCATION_VOLUNTEERS.set(len(grid.fixes))
+            try:
+                await tracks.flush()
+            except Exception:
+                logger.exception("Error writing volunteer tracks; %d points kept for retry", len(tracks.buffer))
+    finally:
+        try:
+            await tracks.flush()
+        except Exception:
+            logger.exception("Error writing volunteer tracks on shutdown; %d points lost", len(tracks.buffer))
+
+
+# ============================================================================
+# PYDANTIC SCHEMAS
+# ============================================================================
+
+class LocationFix(BaseModel):
+    latitude: float = Field(..., ge=-90, le=90)
+    longitude: float = Field(..., ge=-180, le=180)
+    available: bool = True
+
+
+class NearbyVolunteer(BaseModel):
+    volunteer_id: int
+    latitude: float
+    longitude: float
+    distance_m: float
+    age_seconds: float
+
+
+# ============================================================================
+# API ROUTER
+# ============================================================================
+
+router = APIRouter(tags=["Volunteers"])
+
+
+def volunteer_id_from_token(token: str) -> int:
+    payload = decode_token(token)
+    if not payload:
+        raise HTTPException(status_code=401, detail="Invalid or expired token")
+    if payload.get("role") != UserRole.VOLUNTEER.value:
+        raise HTTPException(status_code=403, detail="Only volunteers can share location")
+    if "uid" not in payload:
+        raise HTTPException(status_code=401, detail="Token has no user id. Please log in again.")
+    return int(payload["uid"])
+
+
+def require_dispatch_role(token: str):
+    """Live volunteer positions are only visible to roles that dispatch pickups"""
+    payload = decode_token(token)
+    if not payload:
+        raise HTTPException(status_code=401, detail="Invalid or expired token")
+    if payload.get("role") not in DISPATCH_ROLES:
+        raise HTTPException(status_code=403, detail="Not allowed to view volunteer locations")
+
+
+@router.post("/api/volunteers/location", status_code=204)
+async def post_location(fix: LocationFix, token: str):
+    """
+    Single location fix (for clients that can't hold a WebSocket).
+    Pass token as query parameter: /api/volunteers/location?token=your_token
+    """
+    record_fix(volunteer_id_from_token(token), fix.latitude, fix.longitude, fix.available)
+
+
+@router.get("/api/volunteers/nearest", response_model=List[NearbyVolunteer])
+async def get_nearest_volunteers(
+    token: str,
+    latitude: float = Query(..., ge=-90, le=90),
+    longitude: float = Query(..., ge=-180, le=180),
+    k: int = Query(5, ge=1, le=50)
+):
+    """
+    Closest available volunteers with a recent fix (dispatchers, NGOs, admins).
+    Pass token as query parameter: /api/volunteers/nearest?token=your_token&...
+    """
+    require_dispatch_role(token)
+    return nearest_volunteers(latitude, longitude, k)
+
+
+@router.websocket("/ws/locations")
+async def location_stream(websocket: WebSocket, token: str):
+    """
+    Location stream for volunteer phones: /ws/locations?token=your_token
+    Send {"latitude": .., "longitude": .., "available": true} every few seconds.
+    """
+    try:
+        volunteer_id = volunteer_id_from_token(token)
+    except HTTPException as e:
+        await websocket.close(code=1008, reason=e.detail)
+        return
+
+    await websocket.accept()
+    try:
+        while True:
+            raw = await websocket.receive_text()
+            try:
+                fix = LocationFix(**json.loads(raw))
+            except (ValueError, ValidationError, TypeError) as e:
+                await websocket.send_json({"event": "ERROR", "detail": str(e)})
+                continue
+            record_fix(volunteer_id, fix.latitude, fix.longitude, fix.available)
+    except WebSocketDisconnect:
+        pass
@@ -0,0 +1,259 @@
+"""
+FoodRescue Platform - Metrics & Tracing
+Prometheus metrics for HTTP routes, SQL queries, the connection pool,
+WebSocket fan-out and background tasks, plus optional OpenTelemetry spans.
+"""
+
+import logging
+import time
+from contextlib import contextmanager, nullcontext
+
+from fastapi import APIRouter, BackgroundTasks, Response
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from config import settings
+from database import active_engines
+
+logger = logging.getLogger("foodrescue.metrics")
+
+# ============================================================================
+# METRIC DEFINITIONS
+# ============================================================================
+
+HTTP_REQUEST_DURATION = Histogram(
+    "foodrescue_http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+)
+
+SQL_QUERY_DURATION = Histogram(
+    "foodrescue_sql_query_duration_seconds",
+    "SQL statement execution time",
+    ["operation"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+
+SQL_SLOW_QUERIES = Counter(
+    "foodrescue_sql_slow_queries_total",
+    "SQL statements slower than SLOW_QUERY_MS",
+    ["operation"],
+)
+
+DB_POOL_CONNECTIONS = Gauge(
+    "foodrescue_db_pool_connections",
+    "Connection pool usage",
+    ["engine", "state"],
+)
+
+DB_READ_ROUTING = Counter(
+    "foodrescue_db_read_routing_total",
+    "Read-only sessions by routing decision",
+    ["target"],
+)
+
+WS_CONNECTIONS = Gauge(
+    "foodrescue_ws_connections",
+    "Open WebSocket connections",
+)
+
+WS_BROADCAST_DURATION = Histogram(
+    "foodrescue_ws_broadcast_duration_seconds",
+    "Time to fan a message out to all WebSocket clients",
+    ["event"],
+)
+
+WS_SEND_FAILURES = Counter(
+    "foodrescue_ws_send_failures_total",
+    "WebSocket sends that raised during broadcast",
+    ["event"],
+)
+
+LOCATION_FIXES = Counter(
+    "foodrescue_location_fixes_total",
+    "Volunteer GPS fixes ingested",
+)
+
+LOCATION_VOLUNTEERS = Gauge(
+    "foodrescue_location_volunteers",
+    "Volunteers currently held in the location grid",
+)
+
+LOCATION_TRACK_BUFFER = Gauge(
+    "foodrescue_location_track_buffer",
+    "Downsampled track points waiting to be written",
+)
+
+BACKGROUND_TASKS_PENDING = Gauge(
+    "foodrescue_background_tasks_pending",
+    "Background tasks queued but not yet finished",
+    ["task"],
+)
+
+# ============================================================================
+# HTTP MIDDLEWARE
+# ============================================================================
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency per route template (not raw path)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            # Unmatched paths share one label so scanners can't blow up cardinality
+            route_path = getattr(route, "path", "<unmatched>")
+            HTTP_REQUEST_DURATION.labels(scope["method"], route_path, str(status_code)).observe(
+                time.perf_counter() - start
+            )
+
+
+# ============================================================================
+# SQLALCHEMY INSTRUMENTATION
+# ============================================================================
+
+def _operation(statement: str) -> str:
+    return statement.lstrip().split(" ", 1)[0].upper() or "UNKNOWN"
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+    operation = _operation(statement)
+    SQL_QUERY_DURATION.labels(operation).observe(elapsed)
+
+    if elapsed * 1000 >= settings.slow_query_ms:
+        SQL_SLOW_QUERIES.labels(operation).inc()
+        logger.warning("Slow query (%.1f ms): %s", elapsed * 1000, " ".join(statement.split()))
+
+
+def _handle_error(exception_context):
+    # Keep the timing stack balanced when a statement fails
+    starts = exception_context.connection.info.get("query_start_time") if exception_context.connection else None
+    if starts:
+        starts.pop()
+
+
+event.listen(Engine, "handle_error", _handle_error)
+
+
+def record_pool_usage(name: str, engine: Engine):
+    pool = engine.pool
+    if not hasattr(pool, "checkedout"):
+        return
+    DB_POOL_CONNECTIONS.labels(name, "checked_out").set(pool.checkedout())
+    DB_POOL_CONNECTIONS.labels(name, "checked_in").set(pool.checkedin())
+    DB_POOL_CONNECTIONS.labels(name, "overflow").set(max(pool.overflow(), 0))
+    DB_POOL_CONNECTIONS.labels(name, "size").set(pool.size())
+
+
+# ============================================================================
+# BACKGROUND TASKS
+# ============================================================================
+
+def add_tracked_task(background_tasks: BackgroundTasks, func, *args, **kwargs):
+    """BackgroundTasks.add_task that keeps the pending-task gauge up to date"""
+    gauge = BACKGROUND_TASKS_PENDING.labels(func.__name__)
+    gauge.inc()
+
+    def run():
+        try:
+            func(*args, **kwargs)
+        finally:
+            gauge.dec()
+
+    background_tasks.add_task(run)
+
+
+# ============================================================================
+# TRACING (optional OpenTelemetry)
+# ============================================================================
+
+_tracer = None
+
+
+def setup_tracing(app):
+    """Export spans to an OTLP collector if OTEL_ENABLED and the SDK is installed"""
+    global _tracer
+    if not settings.otel_enabled:
+        return
+
+    try:
+        from opentelemetry import trace
+        from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    except ImportError:
+        logger.warning("OTEL_ENABLED is set but opentelemetry is not installed; tracing disabled")
+        return
+
+    provider = TracerProvider(resource=Resource.create({"service.name": settings.otel_service_name}))
+    provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter(endpoint=settings.otel_endpoint, insecure=True)))
+    trace.set_tracer_provider(provider)
+    _tracer = trace.get_tracer("foodrescue")
+
+    try:
+        from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+        FastAPIInstrumentor.instrument_app(app)
+    except ImportError:
+        logger.info("opentelemetry-instrumentation-fastapi not installed; skipping route spans")
+
+    try:
+        from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor
+        SQLAlchemyInstrumentor().instrument()
+    except ImportError:
+        logger.info("opentelemetry-instrumentation-sqlalchemy not installed; skipping SQL spans")
+
+
+def span(name: str, **attributes):
+    """Tracing span, or a no-op when tracing is disabled"""
+    if _tracer is None:
+        return nullcontext()
+    return _tracer.start_as_current_span(name, attributes=attributes)
+
+
+@contextmanager
+def observe_broadcast(event_name: str):
+    start = time.perf_counter()
+    with span("ws.broadcast", event=event_name):
+        yield
+    WS_BROADCAST_DURATION.labels(event_name).observe(time.perf_counter() - start)
+
+
+# ============================================================================
+# /metrics ENDPOINT
+# ============================================================================
+
+router = APIRouter(tags=["Monitoring"])
+
+
+@router.get("/metrics", include_in_schema=False)
+def metrics_endpoint():
+    # Pool gauges are sampled at scrape time
+    for name, engine in active_engines().items():
+        record_pool_usage(name, engine)
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
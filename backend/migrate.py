@@ -0,0 +1,37 @@
+"""
+FoodRescue Platform - Schema Migration
+Explicit schema setup step: python migrate.py [--rebuild-rollups] [--rebuild-heatmap]
+"""
+
+import argparse
+
+import main  # noqa: F401  (registers all models on Base)
+from database import SessionLocal, init_schema, dispose_engine
+from heatmap import rebuild_heatmap
+from rollups import rebuild_rollups
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create or update the database schema")
+    parser.add_argument("--rebuild-rollups", action="store_true",
+                        help="Recompute /api/stats summary tables from donations (locks writes meanwhile)")
+    parser.add_argument("--rebuild-heatmap", action="store_true",
+                        help="Recompute heatmap cells from donations (expiry history is lost)")
+    args = parser.parse_args()
+
+    init_schema()
+    print("✅ Database schema is up to date")
+
+    rebuilds = [(args.rebuild_rollups, rebuild_rollups, "Rollups"),
+                (args.rebuild_heatmap, rebuild_heatmap, "Heatmap")]
+    for requested, rebuild, label in rebuilds:
+        if not requested:
+            continue
+        db = SessionLocal()
+        try:
+            rebuild(db)
+        finally:
+            db.close()
+        print(f"✅ {label} rebuilt")
+
+    dispose_engine()
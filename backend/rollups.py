@@ -0,0 +1,252 @@
+"""
+FoodRescue Platform - Impact & Operations Rollups
+Summary tables kept current by a trigger on every donation state change,
+served by /api/stats without scanning the donations table.
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+from fastapi import APIRouter, Depends, Query
+from pydantic import BaseModel
+from sqlalchemy import Column, Date, Float, Integer, String, Table, select, text
+from sqlalchemy.orm import Session
+
+from database import Base, POST_CREATE_STATEMENTS, create_trigger_if_missing
+from routing import get_read_db
+
+# Assignment latency histogram resolution: 1-minute buckets up to this cap,
+# everything slower lands in the last bucket
+MAX_LATENCY_BUCKET_MINUTES = 24 * 60
+# Longest /api/stats window, like heatmap.MAX_RANGE_DAYS
+MAX_STATS_DAYS = 366
+
+# ============================================================================
+# SUMMARY TABLES
+# ============================================================================
+
+# Current number of donations per status (mirrors the donations table)
+status_counts = Table(
+    "rollup_status_counts", Base.metadata,
+    Column("status", String(20), primary_key=True),
+    Column("count", Integer, nullable=False, default=0),
+)
+
+# Donated / rescued (DELIVERED) kg per creation day and food type.
+# Not decremented when expired rows are cleaned up, so history survives.
+daily_food = Table(
+    "rollup_daily_food", Base.metadata,
+    Column("day", Date, primary_key=True),
+    Column("food_type", String(20), primary_key=True),
+    Column("donated_count", Integer, nullable=False, default=0),
+    Column("donated_kg", Float, nullable=False, default=0),
+    Column("rescued_count", Integer, nullable=False, default=0),
+    Column("rescued_kg", Float, nullable=False, default=0),
+)
+
+# Histogram of minutes from creation to assignment
+assignment_latency = Table(
+    "rollup_assignment_latency", Base.metadata,
+    Column("bucket_minutes", Integer, primary_key=True),
+    Column("count", Integer, nullable=False, default=0),
+)
+
+# ============================================================================
+# TRIGGER + BACKFILL (run by init_schema after create_all)
+# ============================================================================
+
+_LATENCY_BUCKET_SQL = (
+    "LEAST(GREATEST(floor(extract(epoch FROM {assigned} - {created}) / 60)::integer, 0), "
+    f"{MAX_LATENCY_BUCKET_MINUTES})"
+)
+
+TRIGGER_STATEMENTS = [
+    f"""
+    CREATE OR REPLACE FUNCTION rollup_donation_change() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'DELETE' THEN
+            -- Only the live status counts follow deletes; impact history is kept
+            UPDATE rollup_status_counts SET count = count - 1 WHERE status = OLD.status::text;
+            RETURN OLD;
+        END IF;
+
+        IF TG_OP = 'INSERT' THEN
+            -- status has no server default; raw inserts may leave it NULL (not counted)
+            IF NEW.status IS NOT NULL THEN
+                INSERT INTO rollup_status_counts (status, count) VALUES (NEW.status::text, 1)
+                ON CONFLICT (status) DO UPDATE SET count = rollup_status_counts.count + 1;
+            END IF;
+
+            INSERT INTO rollup_daily_food (day, food_type, donated_count, donated_kg, rescued_count, rescued_kg)
+            VALUES (NEW.created_at::date, NEW.food_type::text, 1, NEW.quantity_kg, 0, 0)
+            ON CONFLICT (day, food_type) DO UPDATE SET
+                donated_count = rollup_daily_food.donated_count + 1,
+                donated_kg = rollup_daily_food.donated_kg + EXCLUDED.donated_kg;
+
+            IF NEW.status::text = 'DELIVERED' THEN
+                UPDATE rollup_daily_food SET
+                    rescued_count = rescued_count + 1,
+                    rescued_kg = rescued_kg + NEW.quantity_kg
+                WHERE day = NEW.created_at::date AND food_type = NEW.food_type::text;
+            END IF;
+
+            IF NEW.assigned_at IS NOT NULL THEN
+                INSERT INTO rollup_assignment_latency (bucket_minutes, count)
+                VALUES ({_LATENCY_BUCKET_SQL.format(assigned="NEW.assigned_at", created="NEW.created_at")}, 1)
+                ON CONFLICT (bucket_minutes) DO UPDATE SET count = rollup_assignment_latency.count + 1;
+            END IF;
+            RETURN NEW;
+        END IF;
+
+        -- UPDATE
+        IF OLD.status IS DISTINCT FROM NEW.status THEN
+            -- One upsert, rows locked in status order: concurrent transitions in
+            -- opposite directions would otherwise deadlock on the two rows
+            INSERT INTO rollup_status_counts (status, count)
+            SELECT status, delta
+            FROM (VALUES (OLD.status::text, -1), (NEW.status::text, 1)) AS change (status, delta)
+            WHERE status IS NOT NULL
+            ORDER BY status
+            ON CONFLICT (status) DO UPDATE SET count = rollup_status_counts.count + EXCLUDED.count;
+
+            IF NEW.status::text = 'DELIVERED' THEN
+                INSERT INTO rollup_daily_food (day, food_type, donated_count, donated_kg, rescued_count, rescued_kg)
+                VALUES (NEW.created_at::date, NEW.food_type::text, 0, 0, 1, NEW.quantity_kg)
+                ON CONFLICT (day, food_type) DO UPDATE SET
+                    rescued_count = rollup_daily_food.rescued_count + 1,
+                    rescued_kg = rollup_daily_food.rescued_kg + EXCLUDED.rescued_kg;
+            ELSIF OLD.status::text = 'DELIVERED' THEN
+                UPDATE rollup_daily_food SET
+                    rescued_count = rescued_count - 1,
+                    rescued_kg = rescued_kg - OLD.quantity_kg
+                WHERE day = OLD.created_at::date AND food_type = OLD.food_type::text;
+            END IF;
+        END IF;
+
+        -- Creation -> assignment latency, counted once when assigned_at is first set
+        IF OLD.assigned_at IS NULL AND NEW.assigned_at IS NOT NULL THEN
+            INSERT INTO rollup_assignment_latency (bucket_minutes, count)
+            VALUES ({_LATENCY_BUCKET_SQL.format(assigned="NEW.assigned_at", created="NEW.created_at")}, 1)
+            ON CONFLICT (bucket_minutes) DO UPDATE SET count = rollup_assignment_latency.count + 1;
+        END IF;
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    create_trigger_if_missing(
+        "donations_rollup", "donations",
+        "AFTER INSERT OR UPDATE OF status, assigned_at OR DELETE ON donations "
+        "FOR EACH ROW EXECUTE FUNCTION rollup_donation_change()",
+    ),
+]
+
+# Backfill from existing rows; skipped (no scan) once a rollup table is populated
+BACKFILL_STATEMENTS = [
+    """
+    INSERT INTO rollup_status_counts (status, count)
+    SELECT status::text, count(*) FROM donations
+    WHERE status IS NOT NULL AND NOT EXISTS (SELECT 1 FROM rollup_status_counts)
+    GROUP BY status
+    ON CONFLICT (status) DO NOTHING
+    """,
+    """
+    INSERT INTO rollup_daily_food (day, food_type, donated_count, donated_kg, rescued_count, rescued_kg)
+    SELECT created_at::date, food_type::text,
+           count(*), sum(quantity_kg),
+           count(*) FILTER (WHERE status::text = 'DELIVERED'),
+           coalesce(sum(quantity_kg) FILTER (WHERE status::text = 'DELIVERED'), 0)
+    FROM donations
+    WHERE NOT EXISTS (SELECT 1 FROM rollup_daily_food)
+    GROUP BY created_at::date, food_type
+    ON CONFLICT (day, food_type) DO NOTHING
+    """,
+    f"""
+    INSERT INTO rollup_assignment_latency (bucket_minutes, count)
+    SELECT {_LATENCY_BUCKET_SQL.format(assigned="assigned_at", created="created_at")}, count(*)
+    FROM donations
+    WHERE assigned_at IS NOT NULL AND NOT EXISTS (SELECT 1 FROM rollup_assignment_latency)
+    GROUP BY 1
+    ON CONFLICT (bucket_minutes) DO NOTHING
+    """,
+]
+
+# Registered on import, like the models on Base
+POST_CREATE_STATEMENTS.extend(TRIGGER_STATEMENTS + BACKFILL_STATEMENTS)
+
+
+def rebuild_rollups(db: Session):
+    """Recompute all rollups from the donations table (e.g. after manual SQL fixes)"""
+    db.execute(text("LOCK TABLE donations IN SHARE MODE"))
+    for table in (status_counts, daily_food, assignment_latency):
+        db.execute(table.delete())
+    for statement in BACKFILL_STATEMENTS:
+        db.execute(text(statement))
+    db.commit()
+
+
+# ============================================================================
+# PYDANTIC SCHEMAS
+# ============================================================================
+
+class DailyFoodStats(BaseModel):
+    day: date
+    food_type: str
+    donated_count: int
+    donated_kg: float
+    rescued_count: int
+    rescued_kg: float
+
+
+class StatsResponse(BaseModel):
+    status_counts: Dict[str, int]
+    daily: List[DailyFoodStats]
+    assignments_measured: int
+    median_minutes_to_assignment: Optional[float]
+
+
+# ============================================================================
+# API ROUTER
+# ============================================================================
+
+router = APIRouter(prefix="/api/stats", tags=["Statistics"])
+
+
+def median_from_histogram(buckets: List[tuple]) -> Optional[float]:
+    """Median bucket (minutes) from (bucket_minutes, count) rows sorted by bucket"""
+    total = sum(count for _, count in buckets)
+    if total == 0:
+        return None
+    midpoint = (total + 1) / 2
+    seen = 0
+    for bucket, count in buckets:
+        seen += count
+        if seen >= midpoint:
+            return float(bucket)
+    return float(buckets[-1][0])
+
+
+@router.get("", response_model=StatsResponse)
+def get_stats(days: int = Query(30, ge=1, le=MAX_STATS_DAYS), db: Session = Depends(get_read_db)):
+    """
+    Live coordinator counts: donations by status, kg donated/rescued per
+    food type per day (last `days` days) and median time to assignment.
+    Reads only the rollup tables.
+    """
+    since = (datetime.utcnow() - timedelta(days=days)).date()
+
+    counts = {status: count for status, count in db.execute(select(status_counts))}
+    daily = db.execute(
+        select(daily_food).where(daily_food.c.day >= since).order_by(daily_food.c.day, daily_food.c.food_type)
+    ).mappings().all()
+    latency = db.execute(
+        select(assignment_latency.c.bucket_minutes, assignment_latency.c.count)
+        .where(assignment_latency.c.count > 0)
+        .order_by(assignment_latency.c.bucket_minutes)
+    ).all()
+
+    return StatsResponse(
+        status_counts=counts,
+        daily=[DailyFoodStats(**row) for row in daily],
+        assignments_measured=sum(count for _, count in latency),
+        median_minutes_to_assignment=median_from_histogram(latency),
+    )
@@ -0,0 +1,182 @@
+"""
+FoodRescue Platform - Read Replica Routing
+Sends read-only handlers to replicas (REPLICA_URLS) with health-aware
+failover to the primary and read-your-writes stickiness after a client writes.
+"""
+
+import itertools
+import time
+from http.cookies import SimpleCookie
+from typing import Dict, Optional
+
+from fastapi import Request
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import DBAPIError
+
+from config import settings
+from database import SessionLocal, get_engine, get_named_engine
+from metrics import DB_READ_ROUTING
+
+STICKY_COOKIE = "fr_last_write"
+# Same value as the cookie, for clients that don't keep cookies: echo it back on reads
+STICKY_HEADER = "X-Last-Write"
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+# Only writes under these paths land in replicated tables that the read routes serve
+STICKY_PATH_PREFIXES = ("/api/donations",)
+
+# replica name -> monotonic time until which it is skipped
+_replica_down_until: Dict[str, float] = {}
+# replica name -> monotonic time until which its last lag check stays valid
+_replica_lag_checked_until: Dict[str, float] = {}
+_replica_cycle = itertools.count()
+
+# ============================================================================
+# REPLICA SELECTION
+# ============================================================================
+
+def _replica_urls() -> list:
+    return [url.strip() for url in settings.replica_urls.split(",") if url.strip()]
+
+
+# Seconds of WAL not yet replayed; 0 when everything received has been replayed
+# (an idle primary leaves the last replay timestamp old without any real lag)
+REPLICA_LAG_QUERY = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE coalesce(extract(epoch FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+"""
+
+
+def _replica_lag_seconds(connection: Connection) -> float:
+    return float(connection.execute(text(REPLICA_LAG_QUERY)).scalar())
+
+
+def _mark_down(name: str, now: float, reason: str):
+    _replica_down_until[name] = now + settings.replica_retry_seconds
+    DB_READ_ROUTING.labels(reason).inc()
+
+
+def _connect_replica() -> Optional[Connection]:
+    """Connection to the next healthy, caught-up replica (round-robin), or None"""
+    urls = _replica_urls()
+    if not urls:
+        return None
+
+    now = time.monotonic()
+    offset = next(_replica_cycle)
+    for i in range(len(urls)):
+        index = (offset + i) % len(urls)
+        name = f"replica-{index}"
+        if _replica_down_until.get(name, 0) > now:
+            continue
+        try:
+            # Bounded connect so a silent replica host fails fast instead of at the TCP timeout
+            engine = get_named_engine(
+                name, urls[index],
+                connect_args={"connect_timeout": settings.replica_connect_timeout_seconds},
+            )
+            connection = engine.connect()
+        except DBAPIError:
+            # Skip this replica for a while instead of paying the connect timeout on every read
+            _mark_down(name, now, "failover")
+            continue
+
+        if _replica_lag_checked_until.get(name, 0) > now:
+            return connection
+        try:
+            lag = _replica_lag_seconds(connection)
+        except DBAPIError:
+            connection.close()
+            _mark_down(name, now, "failover")
+            continue
+        # End the autobegun transaction so the session starts its own
+        connection.rollback()
+        if lag > settings.replica_max_lag_seconds:
+            # Behind by more than reads can tolerate: skip it like a failed connect
+            connection.close()
+            _mark_down(name, now, "lagging")
+            continue
+        _replica_lag_checked_until[name] = now + settings.replica_retry_seconds
+        return connection
+    return None
+
+
+# ============================================================================
+# READ-YOUR-WRITES STICKINESS
+# ============================================================================
+
+def wrote_recently(request: Request) -> bool:
+    marker = request.cookies.get(STICKY_COOKIE) or request.headers.get(STICKY_HEADER)
+    if not marker:
+        return False
+    try:
+        return time.time() - float(marker) < settings.replica_sticky_seconds
+    except ValueError:
+        return False
+
+
+def _is_tracked_write(scope) -> bool:
+    return (
+        scope["type"] == "http"
+        and scope["method"] not in SAFE_METHODS
+        and scope["path"].startswith(STICKY_PATH_PREFIXES)
+    )
+
+
+class ReadYourWritesMiddleware:
+    """Marks clients that just wrote donations so their next reads go to the primary"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if not _is_tracked_write(scope) or not _replica_urls():
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                marker = f"{time.time():.3f}"
+                cookie = SimpleCookie()
+                cookie[STICKY_COOKIE] = marker
+                cookie[STICKY_COOKIE]["max-age"] = int(settings.replica_sticky_seconds) + 1
+                cookie[STICKY_COOKIE]["path"] = "/"
+                cookie[STICKY_COOKIE]["httponly"] = True
+                headers = list(message.get("headers", []))
+                headers.append((b"set-cookie", cookie.output(header="").strip().encode("latin-1")))
+                headers.append((STICKY_HEADER.lower().encode("latin-1"), marker.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+# ============================================================================
+# DEPENDENCY
+# ============================================================================
+
+def get_read_db(request: Request):
+    """
+    Session for read-only handlers.
+    Uses a replica unless the client wrote recently (cookie or X-Last-Write
+    header) or no replica is healthy.
+    """
+    connection = None
+    if not wrote_recently(request):
+        connection = _connect_replica()
+        DB_READ_ROUTING.labels("replica" if connection is not None else "primary").inc()
+    else:
+        DB_READ_ROUTING.labels("sticky").inc()
+
+    if connection is None:
+        db = SessionLocal(bind=get_engine())
+    else:
+        db = SessionLocal(bind=connection)
+    try:
+        yield db
+    finally:
+        db.close()
+        if connection is not None:
+            connection.close()
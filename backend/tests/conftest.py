@@ -0,0 +1,72 @@
+"""
+Shared test setup: run from backend/ with `python -m pytest`.
+Database-backed tests skip themselves when their URLs are not set.
+
+Query plan tests need a throwaway PostGIS database (it is reset and seeded):
+    TEST_DATABASE_URL=postgresql://localhost/foodrescue_bench python -m pytest
+"""
+
+import os
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, "benchmarks"))
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+# Plan buffer budgets assume roughly this many seeded donations
+PLAN_DONATIONS = int(os.environ.get("TEST_PLAN_DONATIONS", "50000"))
+PLAN_USERS = 20
+
+
+@pytest.fixture(scope="session")
+def plan_database():
+    """Seeded bench database, with the app pointed at it for the session"""
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL not set")
+
+    from config import settings
+    from database import dispose_engine, get_engine
+    from seed import seed
+
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(settings, "database_url", TEST_DATABASE_URL)
+        patch.setattr(settings, "replica_urls", "")
+        dispose_engine()
+        seed(TEST_DATABASE_URL, PLAN_DONATIONS, PLAN_USERS, batch_size=5000, spread_km=3.0,
+             history_days=180, reset=True, seed_value=42)
+        yield get_engine()
+        dispose_engine()
+
+
+@pytest.fixture
+def plan_probe(plan_database):
+    """PlanProbe whose requests and EXPLAINs share one rolled-back transaction"""
+    from fastapi.testclient import TestClient
+
+    import main
+    from database import SessionLocal, get_db
+    from plans import PlanProbe
+    from routing import get_read_db
+
+    conn = plan_database.connect()
+    transaction = conn.begin()
+
+    def session_on_test_connection():
+        # Endpoint commits release a savepoint; the outer transaction is rolled back below
+        db = SessionLocal(bind=conn, join_transaction_mode="create_savepoint")
+        try:
+            yield db
+        finally:
+            db.close()
+
+    main.app.dependency_overrides[get_db] = session_on_test_connection
+    main.app.dependency_overrides[get_read_db] = session_on_test_connection
+    try:
+        yield PlanProbe(TestClient(main.app), conn)
+    finally:
+        main.app.dependency_overrides.clear()
+        transaction.rollback()
+        conn.close()
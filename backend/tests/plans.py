@@ -0,0 +1,90 @@
+"""
+EXPLAIN helpers for the query plan tests.
+
+PlanProbe calls endpoints in-process against TEST_DATABASE_URL, captures the
+SQL they issue and runs EXPLAIN (ANALYZE, BUFFERS) on each statement. All of
+it happens inside one transaction that is rolled back, so writes made by the
+endpoints or by EXPLAIN ANALYZE never reach the seeded data. Writes made by
+the request being explained are undone first, so e.g. a status transition is
+explained as a real transition (triggers included), not as a no-op repeat.
+"""
+
+from typing import Any, List, Tuple
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.engine import Connection
+
+# Tables that grow with history; a Seq Scan on any of them is a regression
+WATCHED_TABLES = {"donations", "users", "heatmap_cells", "volunteer_tracks"}
+
+
+def walk_plan(node: dict, found: list) -> list:
+    found.append(node)
+    for child in node.get("Plans", []):
+        walk_plan(child, found)
+    return found
+
+
+def explain(conn: Connection, statement: str, parameters) -> dict:
+    """EXPLAIN ANALYZE a captured statement inside a savepoint that is rolled back"""
+    savepoint = conn.begin_nested()
+    try:
+        result = conn.exec_driver_sql(
+            "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + statement, parameters
+        ).scalar()
+    finally:
+        savepoint.rollback()
+    return result[0]
+
+
+def summarize(plan: dict, statement: str) -> dict:
+    root = plan["Plan"]
+    nodes = walk_plan(root, [])
+    return {
+        "sql": " ".join(statement.split()),
+        "buffers": root.get("Shared Hit Blocks", 0) + root.get("Shared Read Blocks", 0),
+        "seq_scans": sorted({
+            node["Relation Name"] for node in nodes
+            if node["Node Type"] == "Seq Scan" and node.get("Relation Name") in WATCHED_TABLES
+        }),
+        "indexes": sorted({node["Index Name"] for node in nodes if "Index Name" in node}),
+        "triggers": {trigger["Trigger Name"]: trigger["Calls"] for trigger in plan.get("Triggers", [])},
+        "execution_ms": plan.get("Execution Time"),
+    }
+
+
+class PlanProbe:
+    """Calls endpoints on a rolled-back connection and explains the SQL they issue"""
+
+    def __init__(self, client: TestClient, conn: Connection):
+        self.client = client
+        self.conn = conn
+        self._captured: List[Tuple[str, Any]] = []
+        self._capturing = False
+        event.listen(conn, "before_cursor_execute", self._capture)
+
+    def _capture(self, conn, cursor, statement, parameters, context, executemany):
+        if self._capturing and statement.lstrip().split(" ", 1)[0].upper() in ("SELECT", "INSERT", "UPDATE", "DELETE"):
+            self._captured.append((statement, parameters))
+
+    def statements(self, method: str, url: str, **kwargs) -> List[Tuple[str, Any]]:
+        """SQL issued by one request (the request must succeed)"""
+        self._captured = []
+        self._capturing = True
+        try:
+            response = self.client.request(method, url, **kwargs)
+        finally:
+            self._capturing = False
+        assert response.status_code < 400, f"{method} {url}: HTTP {response.status_code} {response.text[:200]}"
+        assert self._captured, f"{method} {url} issued no SQL"
+        return list(self._captured)
+
+    def plans(self, method: str, url: str, **kwargs) -> List[dict]:
+        """Plans for the SQL issued by one request, explained against the state before it"""
+        before_request = self.conn.begin_nested()
+        try:
+            statements = self.statements(method, url, **kwargs)
+        finally:
+            before_request.rollback()
+        return [summarize(explain(self.conn, statement, parameters), statement) for statement, parameters in statements]
@@ -0,0 +1,251 @@
+"""
+Volunteer live locations: nearest-volunteer grid search against a brute-force
+oracle, track downsampling and flush retry, and the role gates on the endpoints.
+"""
+
+import asyncio
+import math
+import random
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import locations
+import main
+from auth import create_access_token
+from config import settings
+from locations import BRUTE_FORCE_LIMIT, METERS_PER_DEGREE_LAT, Fix, LocationGrid, TrackRecorder
+from routing import get_read_db
+
+CELL_DEG = 0.01
+MAX_AGE = 120.0
+MAX_DISTANCE = 20000.0
+
+
+def brute_force_nearest(grid, latitude, longitude, k, max_age, max_distance):
+    """Oracle: every fix, same filters and distance as LocationGrid.nearest"""
+    cutoff = time.time() - max_age
+    m_per_deg_lng = METERS_PER_DEGREE_LAT * max(math.cos(math.radians(latitude)), 0.01)
+    candidates = []
+    for fix in grid.fixes.values():
+        if not fix.available or fix.timestamp < cutoff:
+            continue
+        dy = (fix.latitude - latitude) * METERS_PER_DEGREE_LAT
+        dx = (fix.longitude - longitude) * m_per_deg_lng
+        distance = math.sqrt(dx * dx + dy * dy)
+        if distance <= max_distance:
+            candidates.append((distance, fix.volunteer_id))
+    candidates.sort()
+    return [volunteer_id for _, volunteer_id in candidates[:k]]
+
+
+def random_grid(rng, count, spread_deg, clusters):
+    grid = LocationGrid(CELL_DEG)
+    now = time.time()
+    centers = [(13.0 + rng.uniform(-0.2, 0.2), 80.2 + rng.uniform(-0.2, 0.2)) for _ in range(clusters)]
+    for volunteer_id in range(count):
+        lat, lng = rng.choice(centers)
+        grid.update(
+            volunteer_id,
+            lat + rng.gauss(0, spread_deg),
+            lng + rng.gauss(0, spread_deg),
+            available=rng.random() > 0.2,
+            # ~10% stale
+            timestamp=now - (MAX_AGE + 60 if rng.random() < 0.1 else rng.uniform(0, MAX_AGE / 2)),
+        )
+    return grid
+
+
+# ============================================================================
+# GRID SEARCH
+# ============================================================================
+
+@pytest.mark.parametrize("count", [5, BRUTE_FORCE_LIMIT, BRUTE_FORCE_LIMIT + 1, 500, 5000])
+@pytest.mark.parametrize("spread_deg,clusters", [(0.002, 1), (0.05, 3), (0.3, 1)])
+def test_nearest_matches_brute_force(count, spread_deg, clusters):
+    rng = random.Random(count * 1000 + clusters)
+    grid = random_grid(rng, count, spread_deg, clusters)
+
+    for _ in range(30):
+        latitude = 13.0 + rng.uniform(-0.4, 0.4)
+        longitude = 80.2 + rng.uniform(-0.4, 0.4)
+        k = rng.choice([1, 3, 5, 20])
+        max_distance = rng.choice([500.0, 5000.0, MAX_DISTANCE])
+
+        found = grid.nearest(latitude, longitude, k, MAX_AGE, max_distance)
+        expected = brute_force_nearest(grid, latitude, longitude, k, MAX_AGE, max_distance)
+
+        assert [fix.volunteer_id for _, fix in found] == expected
+        distances = [distance for distance, _ in found]
+        assert distances == sorted(distances)
+
+
+def test_nearest_skips_stale_and_unavailable():
+    grid = LocationGrid(CELL_DEG)
+    now = time.time()
+    grid.update(1, 13.0, 80.2, available=True, timestamp=now)
+    grid.update(2, 13.0, 80.2001, available=False, timestamp=now)
+    grid.update(3, 13.0, 80.2002, available=True, timestamp=now - MAX_AGE - 1)
+
+    assert [fix.volunteer_id for _, fix in grid.nearest(13.0, 80.2, 5, MAX_AGE, MAX_DISTANCE)] == [1]
+
+
+def test_nearest_respects_max_distance():
+    grid = LocationGrid(CELL_DEG)
+    grid.update(1, 13.0, 80.2)
+    grid.update(2, 13.1, 80.2)  # ~11 km north
+
+    assert [fix.volunteer_id for _, fix in grid.nearest(13.0, 80.2, 5, MAX_AGE, 5000)] == [1]
+    assert len(grid.nearest(13.0, 80.2, 5, MAX_AGE, 20000)) == 2
+
+
+def test_update_moves_volunteer_between_cells():
+    grid = LocationGrid(CELL_DEG)
+    grid.update(1, 13.0, 80.2)
+    grid.update(1, 13.5, 80.7)
+
+    assert len(grid.fixes) == 1
+    assert sum(len(members) for members in grid.cells.values()) == 1
+    assert grid.nearest(13.0, 80.2, 1, MAX_AGE, 1000) == []
+    assert grid.nearest(13.5, 80.7, 1, MAX_AGE, 1000)[0][1].volunteer_id == 1
+
+
+def test_prune_drops_stale_fixes_and_empty_cells():
+    grid = LocationGrid(CELL_DEG)
+    grid.update(1, 13.0, 80.2, timestamp=time.time() - MAX_AGE - 1)
+    grid.update(2, 13.2, 80.4)
+
+    assert grid.prune(MAX_AGE) == 1
+    assert set(grid.fixes) == {2}
+    assert len(grid.cells) == 1
+
+
+# ============================================================================
+# TRACK DOWNSAMPLING + FLUSH
+# ============================================================================
+
+@pytest.fixture
+def track_settings(monkeypatch):
+    monkeypatch.setattr(settings, "track_min_interval_seconds", 30.0)
+    monkeypatch.setattr(settings, "track_min_distance_m", 50.0)
+
+
+def fix_at(volunteer_id, timestamp, north_m=0.0):
+    return Fix(volunteer_id, 13.0 + north_m / METERS_PER_DEGREE_LAT, 80.2, True, timestamp, (0, 0))
+
+
+def test_tracks_keep_one_point_per_interval(track_settings):
+    recorder = TrackRecorder()
+    for second in range(0, 95, 5):
+        recorder.offer(fix_at(1, 1000.0 + second))
+
+    # Kept at t=0, 30, 60, 90
+    assert [row["recorded_at"].timestamp() - 1000.0 for row in recorder.buffer] == [0, 30, 60, 90]
+
+
+def test_tracks_keep_points_after_moving_far_enough(track_settings):
+    recorder = TrackRecorder()
+    recorder.offer(fix_at(1, 1000.0))
+    recorder.offer(fix_at(1, 1001.0, north_m=20))   # too close, too soon
+    recorder.offer(fix_at(1, 1002.0, north_m=60))   # moved 60 m from the last kept point
+    recorder.offer(fix_at(1, 1003.0, north_m=100))  # only 40 m from the last kept point
+
+    assert len(recorder.buffer) == 2
+
+
+def test_tracks_downsample_per_volunteer(track_settings):
+    recorder = TrackRecorder()
+    recorder.offer(fix_at(1, 1000.0))
+    recorder.offer(fix_at(2, 1001.0))
+    recorder.forget([1])
+    recorder.offer(fix_at(1, 1002.0))
+
+    assert [row["volunteer_id"] for row in recorder.buffer] == [1, 2, 1]
+
+
+def test_failed_flush_keeps_points_up_to_cap(track_settings, monkeypatch):
+    inserted = []
+
+    def failing_insert(rows):
+        raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(locations, "MAX_TRACK_BUFFER", 3)
+    monkeypatch.setattr(locations, "_insert_tracks", failing_insert)
+    recorder = TrackRecorder()
+    recorder.offer(fix_at(1, 1000.0))
+    recorder.offer(fix_at(2, 1000.0))
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(recorder.flush())
+    assert [row["volunteer_id"] for row in recorder.buffer] == [1, 2]
+
+    recorder.offer(fix_at(3, 1000.0))
+    recorder.offer(fix_at(4, 1000.0))
+    with pytest.raises(RuntimeError):
+        asyncio.run(recorder.flush())
+    # Oldest dropped beyond the cap, order preserved
+    assert [row["volunteer_id"] for row in recorder.buffer] == [2, 3, 4]
+
+    monkeypatch.setattr(locations, "_insert_tracks", inserted.append)
+    asyncio.run(recorder.flush())
+    assert [row["volunteer_id"] for row in inserted[0]] == [2, 3, 4]
+    assert recorder.buffer == []
+
+
+# ============================================================================
+# ROLE GATES
+# ============================================================================
+
+def token_for(role):
+    return create_access_token({"sub": f"{role.lower()}@example.com", "uid": 42, "role": role})
+
+
+@pytest.fixture
+def client(monkeypatch):
+    # Gates are checked before any query; no database needed
+    main.app.dependency_overrides[get_read_db] = lambda: None
+    monkeypatch.setattr(locations, "grid", LocationGrid(CELL_DEG))
+    monkeypatch.setattr(locations, "tracks", TrackRecorder())
+    yield TestClient(main.app)
+    main.app.dependency_overrides.clear()
+
+
+NEAREST = {"latitude": 13.0, "longitude": 80.2}
+
+
+def test_nearest_requires_token(client):
+    assert client.get("/api/volunteers/nearest", params=NEAREST).status_code == 422
+    assert client.get("/api/volunteers/nearest", params={**NEAREST, "token": "garbage"}).status_code == 401
+
+
+@pytest.mark.parametrize("role", ["VOLUNTEER", "DONOR"])
+def test_nearest_forbidden_for_non_dispatch_roles(client, role):
+    response = client.get("/api/volunteers/nearest", params={**NEAREST, "token": token_for(role)})
+    assert response.status_code == 403
+
+
+@pytest.mark.parametrize("role", ["DISPATCHER", "NGO", "ADMIN"])
+def test_nearest_allowed_for_dispatch_roles(client, role):
+    locations.record_fix(7, 13.0, 80.2)
+    response = client.get("/api/volunteers/nearest", params={**NEAREST, "token": token_for(role)})
+    assert response.status_code == 200
+    assert [v["volunteer_id"] for v in response.json()] == [7]
+
+
+def test_donation_nearest_volunteers_gates(client):
+    url = "/api/donations/1/nearest-volunteers"
+    assert client.get(url, params={"token": "garbage"}).status_code == 401
+    assert client.get(url, params={"token": token_for("VOLUNTEER")}).status_code == 403
+    assert client.get(url, params={"token": token_for("DISPATCHER"), "k": 0}).status_code == 422
+    assert client.get(url, params={"token": token_for("DISPATCHER"), "k": 51}).status_code == 422
+
+
+def test_location_updates_only_from_volunteers(client):
+    fix = {"latitude": 13.0, "longitude": 80.2}
+    assert client.post("/api/volunteers/location", params={"token": "garbage"}, json=fix).status_code == 401
+    assert client.post("/api/volunteers/location", params={"token": token_for("DISPATCHER")},
+                       json=fix).status_code == 403
+    assert client.post("/api/volunteers/location", params={"token": token_for("VOLUNTEER")},
+                       json=fix).status_code == 204
+    assert set(locations.grid.fixes) == {42}
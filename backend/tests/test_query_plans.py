@@ -0,0 +1,129 @@
+"""
+Query plan regressions for every query the hot endpoints issue: each
+statement is run through EXPLAIN (ANALYZE, BUFFERS) on the seeded bench
+database and must not Seq Scan a growing table or exceed its buffer budget.
+Needs TEST_DATABASE_URL (see conftest.py); search queries are covered by
+test_search_plans.py.
+"""
+
+import os
+
+import pytest
+from sqlalchemy import text
+
+from auth import create_access_token
+from bench_data import BENCH_USER_PASSWORD, bench_user_email
+
+# Multiply every buffer budget, e.g. on a database seeded larger than the default
+BUDGET_SCALE = float(os.environ.get("TEST_PLAN_BUDGET_SCALE", "1.0"))
+
+OTP = "123456"
+
+NEW_DONATION = {
+    "donor_name": "Plan Check Kitchen",
+    "donor_phone": "+919876543210",
+    "food_type": "VEG",
+    "quantity_kg": 12.5,
+    "description": "Rice and sambar from lunch service",
+    "latitude": 13.0418,
+    "longitude": 80.2341,
+    "address": "21 Usman Road, T Nagar, Chennai 600017",
+    "expires_at": "2099-01-01T00:00:00",
+}
+
+# (method, path, request kwargs, buffer budget per statement)
+# Budgets assume the default seed (50000 donations).
+CHECKS = {
+    "available": ("GET", "/api/donations/available", {}, 3000),
+    "markers": ("GET", "/api/map/markers", {}, 3000),
+    "donation_by_id": ("GET", "/api/donations/{donation_id}", {}, 50),
+    "donations_page": ("GET", "/api/donations", {"params": {"skip": 1000, "limit": 100}}, 500),
+    "stats": ("GET", "/api/stats", {}, 200),
+    "heatmap": ("GET", "/api/map/heatmap", {"params": {"precision": 6}}, 2000),
+    "nearest_volunteers": ("GET", "/api/donations/{donation_id}/nearest-volunteers",
+                           {"params": {"token": "{dispatcher_token}"}}, 50),
+    "create_donation": ("POST", "/api/donations", {"json": NEW_DONATION}, 200),
+    # AVAILABLE -> ASSIGNED: fires the rollup trigger's status and latency upserts
+    "status_update": ("PATCH", "/api/donations/{donation_id}/status",
+                      {"params": {"new_status": "ASSIGNED"}}, 200),
+    "register": ("POST", "/api/auth/register",
+                 {"json": {"name": "Plan Check", "email": "plan-check@bench.foodrescue.example",
+                           "phone": "+919876543210", "password": "planpass123", "role": "DONOR"}}, 50),
+    "resend_otp": ("POST", "/api/auth/resend-otp", {"json": {"email": bench_user_email(3)}}, 50),
+    "login": ("POST", "/api/auth/login",
+              {"json": {"email": bench_user_email(0), "password": BENCH_USER_PASSWORD}}, 50),
+    "verify_otp": ("POST", "/api/auth/verify-otp", {"json": {"email": bench_user_email(1), "otp": OTP}}, 50),
+    "login_verify": ("POST", "/api/auth/login/verify", {"json": {"email": bench_user_email(2), "otp": OTP}}, 50),
+    "me": ("GET", "/api/auth/me", {"params": {"token": "{user_token}"}}, 50),
+}
+
+
+@pytest.fixture
+def context(plan_probe):
+    """Values substituted into CHECKS, plus OTPs pending for the verify checks"""
+    conn = plan_probe.conn
+    donation_id = conn.execute(
+        text("SELECT id FROM donations WHERE status = 'AVAILABLE' ORDER BY id LIMIT 1")
+    ).scalar()
+    assert donation_id is not None, "seed produced no AVAILABLE donations"
+    conn.execute(
+        text("UPDATE users SET otp_code = :otp, otp_expires_at = now() AT TIME ZONE 'UTC' + interval '10 minutes' "
+             "WHERE email IN (:first, :second)"),
+        {"otp": OTP, "first": bench_user_email(1), "second": bench_user_email(2)},
+    )
+    return {
+        "donation_id": donation_id,
+        "dispatcher_token": create_access_token({"sub": "plans@example.com", "uid": 0, "role": "DISPATCHER"}),
+        "user_token": create_access_token({"sub": bench_user_email(0), "uid": 0, "role": "VOLUNTEER"}),
+    }
+
+
+def _fill(value, context):
+    if isinstance(value, str):
+        return value.format(**context)
+    if isinstance(value, dict):
+        return {key: _fill(item, context) for key, item in value.items()}
+    return value
+
+
+def assert_plans_ok(plans, budget):
+    for plan in plans:
+        assert not plan["seq_scans"], f"Seq Scan on {plan['seq_scans']}: {plan['sql']}"
+        assert plan["buffers"] <= budget * BUDGET_SCALE, (
+            f"{plan['buffers']} buffers > budget {budget * BUDGET_SCALE:.0f}: {plan['sql']}"
+        )
+
+
+@pytest.mark.parametrize("name", CHECKS)
+def test_endpoint_plans(plan_probe, context, name):
+    method, path, kwargs, budget = CHECKS[name]
+    plans = plan_probe.plans(method, path.format(**context), **_fill(kwargs, context))
+    assert_plans_ok(plans, budget)
+
+
+def test_status_update_runs_rollup_trigger(plan_probe, context):
+    plans = plan_probe.plans("PATCH", f"/api/donations/{context['donation_id']}/status",
+                             params={"new_status": "ASSIGNED"})
+    (update,) = [plan for plan in plans if plan["sql"].startswith("UPDATE donations")]
+    assert update["triggers"].get("donations_rollup") == 1, update
+
+
+def test_create_donation_runs_summary_triggers(plan_probe):
+    plans = plan_probe.plans("POST", "/api/donations", json=NEW_DONATION)
+    (insert,) = [plan for plan in plans if plan["sql"].startswith("INSERT INTO donations")]
+    assert insert["triggers"].get("donations_rollup") == 1, insert
+    assert insert["triggers"].get("donations_heatmap") == 1, insert
+
+
+def test_cleanup_plan(plan_probe):
+    """
+    DELETE /api/donations/cleanup in steady state: the seed is mostly past
+    expiry, so clear that backlog first (inside the rolled-back transaction)
+    and refresh statistics, then explain a run with little left to delete.
+    """
+    plan_probe.statements("DELETE", "/api/donations/cleanup")
+    plan_probe.conn.exec_driver_sql("ANALYZE donations")
+
+    plans = plan_probe.plans("DELETE", "/api/donations/cleanup")
+    assert_plans_ok(plans, 200)
+    assert any("idx_donations_expires_at" in plan["indexes"] for plan in plans), plans
@@ -0,0 +1,301 @@
+"""
+Read replica routing: failover, retry window and read-your-writes stickiness.
+
+The unit tests swap the engines for SQLite stand-ins. test_streaming_replication
+runs against a real primary/replica pair when both URLs are set:
+    TEST_PRIMARY_URL=postgresql://... TEST_REPLICA_URL=postgresql://... python -m pytest tests/test_routing.py
+"""
+
+import os
+import time
+import uuid
+
+import pytest
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+from starlette.requests import Request
+
+import routing
+from config import settings
+from database import dispose_engine
+
+LIVE_REPLICA = "postgresql://replica-live/foodrescue"
+DEAD_REPLICA = "postgresql://replica-dead/foodrescue"
+
+
+class UnreachableEngine:
+    """Engine whose connect fails the way psycopg2 does for a dead host"""
+
+    def __init__(self):
+        self.attempts = 0
+
+    def connect(self):
+        self.attempts += 1
+        raise OperationalError("connect", {}, Exception("could not connect to server"))
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def engines(monkeypatch):
+    """SQLite primary and live replica, an unreachable replica, fresh routing state"""
+    primary = create_engine("sqlite://")
+    live = create_engine("sqlite://")
+    dead = UnreachableEngine()
+    by_url = {LIVE_REPLICA: live, DEAD_REPLICA: dead}
+    created = []
+
+    def fake_named_engine(name, url, **engine_kwargs):
+        created.append((name, url, engine_kwargs))
+        return by_url[url]
+
+    clock = FakeClock()
+    # Only the live replica gets far enough to be lag-checked
+    lag = {LIVE_REPLICA: 0.0, "checks": 0}
+
+    def fake_lag(connection):
+        lag["checks"] += 1
+        return lag[LIVE_REPLICA]
+
+    monkeypatch.setattr(routing, "get_named_engine", fake_named_engine)
+    monkeypatch.setattr(routing, "_replica_lag_seconds", fake_lag)
+    monkeypatch.setattr(settings, "replica_max_lag_seconds", 5.0)
+    monkeypatch.setattr(routing, "get_engine", lambda: primary)
+    monkeypatch.setattr(routing.time, "monotonic", clock)
+    monkeypatch.setattr(settings, "replica_retry_seconds", 30.0)
+    monkeypatch.setattr(settings, "replica_sticky_seconds", 5.0)
+    routing._replica_down_until.clear()
+    routing._replica_lag_checked_until.clear()
+
+    yield {"primary": primary, "live": live, "dead": dead, "created": created, "clock": clock, "lag": lag}
+
+    routing._replica_down_until.clear()
+    routing._replica_lag_checked_until.clear()
+    primary.dispose()
+    live.dispose()
+
+
+def read_target(engines) -> str:
+    """Which engine a fresh get_read_db session is bound to"""
+    request = _request()
+    session_gen = routing.get_read_db(request)
+    db = next(session_gen)
+    try:
+        bind = db.get_bind()
+        engine = getattr(bind, "engine", bind)
+        return "primary" if engine is engines["primary"] else "replica"
+    finally:
+        session_gen.close()
+
+
+def _request(headers=None):
+    raw_headers = [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw_headers})
+
+
+# ============================================================================
+# FAILOVER
+# ============================================================================
+
+def test_reads_use_primary_without_replicas(engines, monkeypatch):
+    monkeypatch.setattr(settings, "replica_urls", "")
+    assert read_target(engines) == "primary"
+
+
+def test_reads_use_live_replica(engines, monkeypatch):
+    monkeypatch.setattr(settings, "replica_urls", LIVE_REPLICA)
+    assert read_target(engines) == "replica"
+
+
+def test_unreachable_replica_fails_over_to_primary(engines, monkeypatch):
+    monkeypatch.setattr(settings, "replica_urls", DEAD_REPLICA)
+    assert read_target(engines) == "primary"
+    assert engines["dead"].attempts == 1
+
+
+def test_unreachable_replica_fails_over_to_other_replica(engines, monkeypatch):
+    monkeypatch.setattr(settings, "replica_urls", f"{DEAD_REPLICA},{LIVE_REPLICA}")
+    assert all(read_target(engines) == "replica" for _ in range(4))
+    assert engines["dead"].attempts == 1
+
+
+def test_replica_engines_get_connect_timeout(engines, monkeypatch):
+    monkeypatch.setattr(settings, "replica_urls", LIVE_REPLICA)
+    monkeypatch.setattr(settings, "replica_connect_timeout_seconds", 3)
+    read_target(engines)
+    _, _, engine_kwargs = engines["created"][0]
+    assert engine_kwargs["connect_args"] == {"connect_timeout": 3}
+
+
+def test_failed_replica_skipped_for_retry_window(engines, monkeypatch):
+    monkeypatch.setattr(settings, "replica_urls", DEAD_REPLICA)
+    read_target(engines)
+    assert engines["dead"].attempts == 1
+
+    # Inside REPLICA_RETRY_SECONDS: no new connect attempt
+    engines["clock"].now += 29
+    for _ in range(5):
+        assert read_target(engines) == "primary"
+    assert engines["dead"].attempts == 1
+
+    # After the window the replica is tried again
+    engines["clock"].now += 2
+    read_target(engines)
+    assert engines["dead"].attempts == 2
+
+
+def test_lagging_replica_skipped_for_retry_window(engines, monkeypatch):
+    monkeypatch.setattr(settings, "replica_urls", LIVE_REPLICA)
+    engines["lag"][LIVE_REPLICA] = 12.0
+    assert read_target(engines) == "primary"
+    assert engines["lag"]["checks"] == 1
+
+    engines["clock"].now += 29
+    assert read_target(engines) == "primary"
+    assert engines["lag"]["checks"] == 1
+
+    # Caught up by the time the window ends
+    engines["lag"][LIVE_REPLICA] = 0.5
+    engines["clock"].now += 2
+    assert read_target(engines) == "replica"
+
+
+def test_lag_check_cached_for_retry_window(engines, monkeypatch):
+    monkeypatch.setattr(settings, "replica_urls", LIVE_REPLICA)
+    for _ in range(5):
+        assert read_target(engines) == "replica"
+    assert engines["lag"]["checks"] == 1
+
+    engines["clock"].now += 31
+    read_target(engines)
+    assert engines["lag"]["checks"] == 2
+
+
+def test_lagging_replica_fails_over_to_primary_when_only_replica(engines, monkeypatch):
+    monkeypatch.setattr(settings, "replica_urls", LIVE_REPLICA)
+    monkeypatch.setattr(settings, "replica_max_lag_seconds", 1.0)
+    engines["lag"][LIVE_REPLICA] = 1.5
+    assert read_target(engines) == "primary"
+    assert "replica-0" in routing._replica_down_until
+
+
+# ============================================================================
+# READ-YOUR-WRITES
+# ============================================================================
+
+@pytest.fixture
+def client(engines, monkeypatch):
+    monkeypatch.setattr(settings, "replica_urls", LIVE_REPLICA)
+    app = FastAPI()
+
+    @app.post("/api/donations")
+    def create():
+        return {}
+
+    @app.post("/api/volunteers/location", status_code=204)
+    def location():
+        return None
+
+    @app.post("/api/donations/fail")
+    def fail():
+        raise HTTPException(status_code=400, detail="bad")
+
+    @app.get("/api/donations/target")
+    def target(db: Session = Depends(routing.get_read_db)):
+        bind = db.get_bind()
+        return {"target": "primary" if getattr(bind, "engine", bind) is engines["primary"] else "replica"}
+
+    app.add_middleware(routing.ReadYourWritesMiddleware)
+    return TestClient(app)
+
+
+def test_reads_go_to_primary_after_donation_write(client):
+    assert client.get("/api/donations/target").json()["target"] == "replica"
+    response = client.post("/api/donations")
+    assert routing.STICKY_COOKIE in response.cookies
+    assert client.get("/api/donations/target").json()["target"] == "primary"
+
+
+def test_header_marks_write_for_cookieless_clients(client):
+    marker = client.post("/api/donations").headers[routing.STICKY_HEADER]
+    client.cookies.clear()
+    assert client.get("/api/donations/target").json()["target"] == "replica"
+    response = client.get("/api/donations/target", headers={routing.STICKY_HEADER: marker})
+    assert response.json()["target"] == "primary"
+
+
+def test_sticky_window_expires(client):
+    stale = f"{time.time() - settings.replica_sticky_seconds - 1:.3f}"
+    response = client.get("/api/donations/target", headers={routing.STICKY_HEADER: stale})
+    assert response.json()["target"] == "replica"
+
+
+def test_non_donation_and_failed_writes_are_not_sticky(client):
+    client.post("/api/volunteers/location")
+    client.post("/api/donations/fail")
+    assert routing.STICKY_COOKIE not in client.cookies
+    assert client.get("/api/donations/target").json()["target"] == "replica"
+
+
+def test_stickiness_is_per_client(client):
+    client.post("/api/donations")
+    other = TestClient(client.app)
+    assert other.get("/api/donations/target").json()["target"] == "replica"
+
+
+# ============================================================================
+# STREAMING REPLICATION (real primary + replica)
+# ============================================================================
+
+PRIMARY_URL = os.environ.get("TEST_PRIMARY_URL")
+REPLICA_URL = os.environ.get("TEST_REPLICA_URL")
+
+
+@pytest.mark.skipif(not (PRIMARY_URL and REPLICA_URL), reason="TEST_PRIMARY_URL / TEST_REPLICA_URL not set")
+def test_streaming_replication(monkeypatch):
+    monkeypatch.setattr(settings, "database_url", PRIMARY_URL)
+    monkeypatch.setattr(settings, "replica_urls", f"{REPLICA_URL},postgresql://127.0.0.1:1/unreachable")
+    dispose_engine()
+    routing._replica_down_until.clear()
+
+    def read(sql, headers=None, **params):
+        session_gen = routing.get_read_db(_request(headers))
+        db = next(session_gen)
+        try:
+            return db.execute(text(sql), params).scalar()
+        finally:
+            session_gen.close()
+
+    marker = uuid.uuid4().hex
+    primary = routing.get_engine()
+    try:
+        with primary.begin() as conn:
+            conn.execute(text("CREATE TABLE IF NOT EXISTS routing_replication_probe (marker text PRIMARY KEY)"))
+            conn.execute(text("INSERT INTO routing_replication_probe VALUES (:m)"), {"m": marker})
+
+        # Sticky reads see the write immediately on the primary
+        just_wrote = {routing.STICKY_HEADER: f"{time.time():.3f}"}
+        assert read("SELECT pg_is_in_recovery()", just_wrote) is False
+        assert read("SELECT count(*) FROM routing_replication_probe WHERE marker = :m", just_wrote, m=marker) == 1
+
+        # Other reads land on the standby (the dead URL fails over to it) and catch up
+        for _ in range(4):
+            assert read("SELECT pg_is_in_recovery()") is True
+        deadline = time.monotonic() + 10
+        while read("SELECT count(*) FROM routing_replication_probe WHERE marker = :m", m=marker) != 1:
+            assert time.monotonic() < deadline, "write never reached the replica"
+            time.sleep(0.1)
+    finally:
+        with primary.begin() as conn:
+            conn.execute(text("DELETE FROM routing_replication_probe WHERE marker = :m"), {"m": marker})
+        dispose_engine()
+        routing._replica_down_until.clear()
@@ -0,0 +1,28 @@
+"""
+/api/donations/search must be served by the search indexes
+(idx_donations_search / idx_donations_address_trgm), not by some other
+index that happens to avoid a Seq Scan. Needs TEST_DATABASE_URL.
+"""
+
+import pytest
+
+SEARCH_INDEXES = {"idx_donations_search", "idx_donations_address_trgm"}
+
+SEARCHES = {
+    "dish": {"q": "biryani"},
+    "address": {"q": "Anna Nagar", "status": "DELIVERED"},
+    "nearby": {"q": "rice", "latitude": 13.0418, "longitude": 80.2341, "radius_km": 2},
+    "misspelled_address": {"q": "Velacheri"},
+}
+
+# Shared buffers per statement at the default seed size
+SEARCH_BUFFER_BUDGET = 4000
+
+
+@pytest.mark.parametrize("params", SEARCHES.values(), ids=SEARCHES.keys())
+def test_search_uses_search_indexes(plan_probe, params):
+    (plan,) = plan_probe.plans("GET", "/api/donations/search", params=params)
+
+    assert SEARCH_INDEXES & set(plan["indexes"]), f"search indexes unused: {plan}"
+    assert not plan["seq_scans"], f"Seq Scan on {plan['seq_scans']}: {plan['sql']}"
+    assert plan["buffers"] <= SEARCH_BUFFER_BUDGET, plan